@@ -0,0 +1,5 @@
+"""Synthetic workbooks and stage timings for the publisher apps.
+
+    python -m benchmarks.generate 1k 10k 100k
+    python -m benchmarks.run --sizes 1k,10k,100k -o bench.json
+"""
@@ -0,0 +1,195 @@
+"""Synthetic publisher contact workbooks for benchmarking.
+
+The master sheet has under a thousand contact rows, too few to see how any
+stage scales. ``generate_contacts`` builds a sheet with the same columns and
+the same shape of data at any size: one row per contact, publishers with one
+to eight contacts, "; "-joined Platforms and Genres in the sheet's casing,
+mostly blank "budget range" cells with the sheet's range strings in the
+rest, and blank contacts and URLs at about the real rates.
+
+    python -m benchmarks.generate 100k -o benchmarks/data/contacts_100k.xlsx
+
+Sizes accept k/M suffixes. The same seed always gives the same workbook.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+COLUMNS = ["Publisher", "URL", "Platforms", "Genres", "Contact name", "email", "budget range"]
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+PLATFORMS = ("Mobile", "VR", "PC", "Console")
+GENRES = (
+    "Action", "Adventure", "Arcade", "Casual", "Horror", "Indie", "Platformer", "Puzzle", "Racing", "Rpg",
+    "Shooter", "Simulation", "Sports", "Strategy",
+)
+# Weighted like the master sheet: most publishers have no budget on file
+BUDGETS = (
+    (None, 0.91), ("+500k & < 1M", 0.03), ("+250k & < 500k", 0.02), ("< 250k", 0.02), ("+1M & < 2M", 0.015),
+    ("< 250k, +250k & < 500k, +500k & < 1M, +1M & < 2M", 0.004), ("Open ended", 0.001),
+)
+# Contacts per publisher, as counted in the master sheet
+CONTACT_COUNTS = ((1, 0.75), (2, 0.09), (3, 0.11), (4, 0.04), (5, 0.005), (8, 0.005))
+
+_SYLLABLES = (
+    "ar", "bel", "cor", "dra", "el", "fen", "gal", "hex", "ion", "jun", "kor", "lum", "mir", "nov", "or", "pix",
+    "quan", "ra", "sol", "tor", "ul", "vex", "wyn", "xen", "yor", "zel",
+)
+_SUFFIXES = ("Games", "Studios", "Interactive", "Entertainment", "Publishing", "Digital", "Labs", "Works")
+_FIRST = (
+    "Anna", "Ben", "Chloe", "David", "Elena", "Felix", "Grace", "Hugo", "Iris", "Jacek", "Kate", "Liam", "Maya",
+    "Noah", "Olga", "Pawel", "Quinn", "Rosa", "Sam", "Tara", "Umar", "Vera", "Will", "Yuki", "Zoe",
+)
+_LAST = (
+    "Adams", "Bauer", "Chen", "Dubois", "Evans", "Fischer", "Garcia", "Hansen", "Ito", "Jensen", "Kowalski",
+    "Lopez", "Meyer", "Novak", "Olsen", "Petrov", "Rossi", "Schmidt", "Tanaka", "Usman", "Varga", "Weber",
+)
+
+
+def parse_size(text):
+    """``"100k"`` -> 100000; plain integers pass through."""
+    if text in SIZES:
+        return SIZES[text]
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:].lower(), 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def size_label(n):
+    for label, size in SIZES.items():
+        if size == n:
+            return label
+    return str(n)
+
+
+def _weighted(rng, choices, n):
+    values = [value for value, _ in choices]
+    weights = np.array([weight for _, weight in choices], dtype=float)
+    return [values[i] for i in rng.choice(len(values), size=n, p=weights / weights.sum())]
+
+
+def _joined(rng, vocabulary, n, mean_terms, blank_rate):
+    # Terms keep the vocabulary's order, as in the sheet ("Mobile; PC; Console").
+    # Each row is a bitmask over the vocabulary, so each distinct combination
+    # is only formatted once.
+    picks = rng.random((n, len(vocabulary))) < mean_terms / len(vocabulary)
+    empty = np.flatnonzero(~picks.any(axis=1))
+    picks[empty, rng.integers(0, len(vocabulary), size=len(empty))] = True
+    masks = picks.dot(1 << np.arange(len(vocabulary)))
+    masks[rng.random(n) < blank_rate] = 0
+    strings = {0: None}
+    for mask in np.unique(masks):
+        if mask:
+            strings[mask] = "; ".join(term for bit, term in enumerate(vocabulary) if mask >> bit & 1)
+    return [strings[mask] for mask in masks.tolist()]
+
+
+def _publisher_names(rng, n):
+    lengths = rng.integers(2, 4, size=n)
+    syllables = rng.integers(0, len(_SYLLABLES), size=(n, 3))
+    suffixes = rng.integers(0, len(_SUFFIXES), size=n)
+    names = pd.Series([
+        "".join(_SYLLABLES[i] for i in row[:length]).capitalize() + " " + _SUFFIXES[suffix]
+        for row, length, suffix in zip(syllables.tolist(), lengths.tolist(), suffixes.tolist())
+    ])
+    # Name clashes get a number, so every generated publisher stays distinct
+    clashes = names.duplicated()
+    names[clashes] = names[clashes] + " " + pd.Series(np.flatnonzero(clashes), index=names.index[clashes]).astype(str)
+    return names.tolist()
+
+
+def generate_contacts(n_rows, seed=0):
+    """A contacts DataFrame shaped like the master sheet, with exactly ``n_rows`` rows."""
+    rng = np.random.default_rng(seed)
+    # Enough publishers to cover n_rows contacts, then trim the last one
+    mean_contacts = sum(count * weight for count, weight in CONTACT_COUNTS)
+    n_publishers = max(1, int(n_rows / mean_contacts) + 16)
+    per_publisher = np.array(_weighted(rng, CONTACT_COUNTS, n_publishers))
+    while per_publisher.sum() < n_rows:
+        per_publisher = np.concatenate([per_publisher, _weighted(rng, CONTACT_COUNTS, n_publishers)])
+    ends = np.cumsum(per_publisher)
+    n_publishers = int(np.searchsorted(ends, n_rows) + 1)
+    per_publisher = per_publisher[:n_publishers]
+    per_publisher[-1] -= ends[n_publishers - 1] - n_rows
+
+    names = _publisher_names(rng, n_publishers)
+    domains = [name.split()[0].lower() + ".com" for name in names]
+    urls = [None if blank else f"https://www.{domain}" for domain, blank in zip(domains, rng.random(n_publishers) < 0.05)]
+    platforms = _joined(rng, PLATFORMS, n_publishers, 2, blank_rate=0.2)
+    genres = _joined(rng, GENRES, n_publishers, 2, blank_rate=0.2)
+    budgets = _weighted(rng, BUDGETS, n_publishers)
+
+    owner = np.repeat(np.arange(n_publishers), per_publisher)
+    first = rng.choice(_FIRST, size=n_rows)
+    last = rng.choice(_LAST, size=n_rows)
+    blank_contact = rng.random(n_rows) < 0.1
+    contact_names = [None if blank else f"{f} {l}" for f, l, blank in zip(first, last, blank_contact)]
+    emails = [
+        None if blank else f"{f.lower()}.{l.lower()}@{domains[o]}"
+        for f, l, o, blank in zip(first, last, owner, rng.random(n_rows) < 0.1)
+    ]
+
+    return pd.DataFrame({
+        "Publisher": [names[o] for o in owner],
+        "URL": [urls[o] for o in owner],
+        "Platforms": [platforms[o] for o in owner],
+        "Genres": [genres[o] for o in owner],
+        "Contact name": contact_names,
+        "email": emails,
+        "budget range": [budgets[o] for o in owner],
+    }, columns=COLUMNS)
+
+
+def write_workbook(df, path):
+    """Write ``df`` as a single-sheet .xlsx in openpyxl's streaming mode."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(list(df.columns))
+    # Missing values as empty cells, the way the master sheet has them
+    columns = [[None if pd.isna(v) else v for v in df[column].tolist()] for column in df.columns]
+    for values in zip(*columns):
+        sheet.append(values)
+    workbook.save(path)
+    return path
+
+
+def workbook_path(n_rows, seed=0, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"contacts_{size_label(n_rows)}_seed{seed}.xlsx")
+
+
+def ensure_workbook(n_rows, seed=0, data_dir=DATA_DIR):
+    """Path of the generated workbook for ``n_rows``, generating it on first use."""
+    path = workbook_path(n_rows, seed, data_dir)
+    if not os.path.exists(path):
+        write_workbook(generate_contacts(n_rows, seed), path + ".tmp")
+        os.replace(path + ".tmp", path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.generate", description=__doc__.split("\n\n")[0])
+    parser.add_argument("sizes", nargs="+", help="contact rows per workbook, e.g. 1k 10k 100k 1M")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="output path (one size only; default: benchmarks/data/)")
+    args = parser.parse_args(argv)
+    if args.output and len(args.sizes) > 1:
+        parser.error("--output takes a single size")
+
+    for size in args.sizes:
+        n_rows = parse_size(size)
+        if args.output:
+            path = write_workbook(generate_contacts(n_rows, args.seed), args.output)
+        else:
+            path = ensure_workbook(n_rows, args.seed)
+        print(f"{n_rows} contact rows -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
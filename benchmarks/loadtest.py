@@ -0,0 +1,450 @@
+"""Concurrent-session load test for the publisher apps.
+
+Starts the app under ``streamlit run`` in a scratch directory (or uses a
+server already running at ``--url``) and connects simulated browsers to
+its websocket, speaking the same protobuf messages the frontend does. Each
+session browses the way people use the app:
+
+- open: the first script run.
+- keyword: type a keyword in the sidebar and press Enter, later clear it.
+- genre: pick a genre, add a second, then clear the selection.
+- apply: with ``--filter-mode apply``, the keyword and genre changes are
+  made in the form and applied with one click instead.
+- next_page: click Next ▶ under the table, up to three times.
+- tag: tick one tag for the first publisher in the tag table.
+- export: click the download button and fetch the file it serves.
+
+Every action's latency is the time from sending it to the server until
+its rerun finished (or the file arrived). For each concurrency level the
+sessions run side by side and the report gives actions per second and
+p50/p95/p99 latency, overall and per action. Script exceptions count as
+errors::
+
+    python -m benchmarks.loadtest --sessions 1,5,10,25,50 -o load.json
+    python -m benchmarks.loadtest --rows 100k --rounds 3 --think 1.0
+
+Widgets in the results fragment rerun only the fragment, as they do in
+the browser.
+
+The scenario uses the widget keys of the paginated table view, as in
+``final_app.py``; actions whose widget an app doesn't have are skipped.
+Tagging writes to the tag store, so only point ``--url`` at a scratch
+deployment.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from benchmarks.generate import ensure_workbook, parse_size
+from benchmarks.run import app_workdir, run_metadata
+from publisher_core.loader import WORKBOOK_PATH
+from publisher_core.tags import TAG_OPTIONS
+from publisher_core.widgets import FILTER_MODE_ENV
+
+DEFAULT_APP = "final_app.py"
+DEFAULT_SESSIONS = "1,5,10,25,50"
+KEYWORDS = ("games", "studio", "digital", "inter", "ent", "pc", "rpg", "a")
+
+# Widgets the scenario drives: a key, or a label prefix for widgets without one
+KEYWORD_INPUT = "🔎 Keyword"
+GENRE_SELECT = "🎮 Select Genre"
+APPLY_BUTTON = "✅ Apply filters"
+NEXT_BUTTON = "_page_page_next"
+TAG_EDITOR = "_tag_editor_page_"
+DOWNLOAD_BUTTON = "page_export_download"
+
+# Statuses that end a rerun; FINISHED_EARLY_FOR_RERUN means another run follows
+_DONE = (
+    ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+)
+
+
+class Widget:
+    def __init__(self, kind, proto, fragment_id):
+        self.kind = kind
+        self.proto = proto
+        self.fragment_id = fragment_id
+
+    @property
+    def id(self):
+        return self.proto.id
+
+    @property
+    def key(self):
+        # Element ids are "$$ID-<hex digest>-<user key>" ("None" without one);
+        # the user key itself may contain "-"
+        return self.id.split("-", 2)[-1]
+
+
+class Session:
+    """One simulated browser tab, connected to the app's websocket."""
+
+    def __init__(self, url, timeout=120.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.ws = None
+        self.session_id = None
+        self.widgets = []
+        self.errors = []
+        # What the browser sends back on every rerun: each widget it has touched
+        self.states = {}
+        self._requests = 0
+
+    async def connect(self):
+        ws_url = "ws" + self.url[len("http"):] + "/_stcore/stream"
+        self.ws = await websockets.connect(ws_url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    # ─── Messages ───────────────────────────────────────────────────────────
+
+    async def _receive(self):
+        msg = ForwardMsg()
+        msg.ParseFromString(await asyncio.wait_for(self.ws.recv(), self.timeout))
+        kind = msg.WhichOneof("type")
+        if kind == "new_session":
+            self.session_id = msg.new_session.initialize.session_id or self.session_id
+        elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+            element = msg.delta.new_element
+            element_kind = element.WhichOneof("type")
+            proto = getattr(element, element_kind)
+            if element_kind == "exception":
+                self.errors.append(proto.message)
+            elif getattr(proto, "id", ""):
+                self.widgets.append(Widget(element_kind, proto, msg.delta.fragment_id))
+        return kind, msg
+
+    async def rerun(self, fragment_id=""):
+        """Send the widget states and wait until the script run has finished.
+
+        The run redraws every widget, or with ``fragment_id`` that fragment's
+        widgets, so those are dropped and collected again from its deltas.
+        """
+        self.widgets = [w for w in self.widgets if fragment_id and w.fragment_id != fragment_id]
+        request = BackMsg()
+        client = request.rerun_script
+        client.page_script_hash = ""
+        client.fragment_id = fragment_id
+        client.widget_states.widgets.extend(self.states.values())
+        await self.ws.send(request.SerializeToString())
+        # Buttons fire once; the browser doesn't resend them
+        for widget_id in [i for i, state in self.states.items() if state.HasField("trigger_value")]:
+            del self.states[widget_id]
+        while True:
+            kind, msg = await self._receive()
+            if kind == "script_finished" and msg.script_finished in _DONE:
+                return
+
+    def find(self, ref):
+        """The latest widget whose key is ``ref`` or whose key or label starts with it."""
+        for widget in reversed(self.widgets):
+            if widget.key == ref:
+                return widget
+        for widget in reversed(self.widgets):
+            if widget.key.startswith(ref) or getattr(widget.proto, "label", "").startswith(ref):
+                return widget
+        return None
+
+    def stage(self, widget, **value):
+        """Change ``widget`` without a rerun, e.g. ``string_value="rpg"``, as a form does."""
+        state = self.states.setdefault(widget.id, WidgetState())
+        state.Clear()
+        state.id = widget.id
+        (field, value), = value.items()
+        if field.endswith("_array_value"):
+            getattr(state, field).data.extend(value)
+        else:
+            setattr(state, field, value)
+
+    async def set(self, widget, **value):
+        """Change ``widget`` and rerun, submitting its form if it is in one."""
+        self.stage(widget, **value)
+        if getattr(widget.proto, "form_id", "") and "trigger_value" not in value:
+            await self.click(self.submit_button(widget.proto.form_id))
+        else:
+            await self.rerun(widget.fragment_id)
+
+    def submit_button(self, form_id):
+        return next(
+            w for w in self.widgets if w.kind == "button" and w.proto.is_form_submitter and w.proto.form_id == form_id
+        )
+
+    async def click(self, widget):
+        await self.set(widget, trigger_value=True)
+
+    async def download(self, widget):
+        """Fetch a download button's file, asking the server for it first if it is deferred."""
+        url = widget.proto.url
+        if widget.proto.deferred_file_id:
+            self._requests += 1
+            request = BackMsg()
+            operation = request.backend_operation_request
+            operation.request_id = str(self._requests)
+            operation.session_id = self.session_id or ""
+            operation.deferred_file.file_id = widget.proto.deferred_file_id
+            await self.ws.send(request.SerializeToString())
+            while True:
+                kind, msg = await self._receive()
+                response = msg.backend_operation_response
+                if kind == "backend_operation_response" and response.request_id == operation.request_id:
+                    break
+            if response.error_msg:
+                raise RuntimeError(f"download failed: {response.error_msg}")
+            url = response.deferred_file.url
+        return len(await asyncio.to_thread(_fetch, self.url + url if url.startswith("/") else url, self.timeout))
+
+
+def _fetch(url, timeout):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read()
+
+
+# ─── Scenario ───────────────────────────────────────────────────────────────────
+
+
+class Recorder:
+    """Latency samples as ``(action, seconds, ok)``."""
+
+    def __init__(self):
+        self.samples = []
+        self.skipped = 0
+
+    async def time(self, session, action, coro):
+        errors = len(session.errors)
+        started = time.perf_counter()
+        try:
+            await coro
+            ok = len(session.errors) == errors
+        except (OSError, RuntimeError, asyncio.TimeoutError, websockets.WebSocketException) as exc:
+            session.errors.append(f"{action}: {exc!r}")
+            ok = False
+        self.samples.append((action, time.perf_counter() - started, ok))
+        return ok
+
+
+async def browse(session, recorder, rng):
+    """One round of searching, paging, tagging and exporting."""
+
+    async def act(action, ref, how):
+        widget = session.find(ref)
+        if widget is None or getattr(widget.proto, "disabled", False):
+            recorder.skipped += 1
+            return False
+        return await recorder.time(session, action, how(widget))
+
+    keyword = session.find(KEYWORD_INPUT)
+    genres = session.find(GENRE_SELECT)
+    options = [o for o in genres.proto.options if o] if genres else []
+    picks = rng.sample(options, min(2, len(options)))
+    if keyword is not None and genres is not None and keyword.proto.form_id:
+        # Batched filters: set them all, then one rerun for the lot
+        session.stage(keyword, string_value=rng.choice(KEYWORDS))
+        session.stage(genres, string_array_value=picks)
+        await act("apply", APPLY_BUTTON, session.click)
+        session.stage(keyword, string_value="")
+        session.stage(genres, string_array_value=[])
+        await act("apply", APPLY_BUTTON, session.click)
+    else:
+        await act("keyword", KEYWORD_INPUT, lambda w: session.set(w, string_value=rng.choice(KEYWORDS)))
+        for selection in (picks[:1], picks, []):
+            await act("genre", GENRE_SELECT, lambda w: session.set(w, string_array_value=selection))
+        await act("keyword", KEYWORD_INPUT, lambda w: session.set(w, string_value=""))
+
+    for _ in range(3):
+        await act("next_page", NEXT_BUTTON, session.click)
+
+    edit = {"edited_rows": {"0": {rng.choice(TAG_OPTIONS): True}}, "added_rows": [], "deleted_rows": []}
+    await act("tag", TAG_EDITOR, lambda w: session.set(w, string_value=json.dumps(edit)))
+    await act("export", DOWNLOAD_BUTTON, session.download)
+
+
+async def run_session(url, recorder, rng, rounds, think, timeout):
+    session = Session(url, timeout)
+    try:
+        await session.connect()
+        if not await recorder.time(session, "open", session.rerun()):
+            return session.errors
+        for _ in range(rounds):
+            await browse(session, recorder, rng)
+            if think:
+                await asyncio.sleep(rng.uniform(0, 2 * think))
+    except (OSError, websockets.WebSocketException) as exc:
+        session.errors.append(f"connect: {exc!r}")
+    finally:
+        await session.close()
+    return session.errors
+
+
+# ─── Levels ─────────────────────────────────────────────────────────────────────
+
+
+def percentiles(values):
+    if not values:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    cuts = statistics.quantiles(values, n=100, method="inclusive") if len(values) > 1 else values * 99
+    return {
+        "p50_ms": cuts[49] * 1000, "p95_ms": cuts[94] * 1000, "p99_ms": cuts[98] * 1000,
+        "max_ms": max(values) * 1000,
+    }
+
+
+def summarize_level(sessions, samples, skipped, errors, wall):
+    by_action = {}
+    for action, seconds, _ in samples:
+        by_action.setdefault(action, []).append(seconds)
+    failed = sum(1 for _, _, ok in samples if not ok)
+    return {
+        "sessions": sessions,
+        "actions": len(samples),
+        "failed": failed,
+        "skipped": skipped,
+        "wall_s": wall,
+        "actions_per_s": len(samples) / wall if wall else None,
+        "latency": percentiles([seconds for _, seconds, _ in samples]),
+        "by_action": {
+            action: {"count": len(values), **percentiles(values)} for action, values in sorted(by_action.items())
+        },
+        "errors": errors[:20],
+    }
+
+
+async def run_level(url, sessions, rounds=2, think=0.0, seed=0, timeout=120.0):
+    recorder = Recorder()
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        run_session(url, recorder, random.Random(seed * 1_000 + i), rounds, think, timeout)
+        for i in range(sessions)
+    ))
+    wall = time.perf_counter() - started
+    errors = [error for session_errors in results for error in session_errors]
+    return summarize_level(sessions, recorder.samples, recorder.skipped, errors, wall)
+
+
+# ─── Server ─────────────────────────────────────────────────────────────────────
+
+
+def wait_for_server(url, timeout=60.0, process=None):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(url + "/_stcore/health", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except (OSError, urllib.error.URLError):
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"no server at {url} after {timeout:.0f}s")
+
+
+def start_server(app_path, workdir, port, log, filter_mode="live"):
+    """``streamlit run app_path`` in ``workdir``; ``app_path`` must be absolute."""
+    env = {**os.environ, FILTER_MODE_ENV: filter_mode}
+    command = [
+        sys.executable, "-m", "streamlit", "run", app_path,
+        "--server.headless", "true", "--server.port", str(port), "--server.fileWatcherType", "none",
+        "--browser.gatherUsageStats", "false",
+    ]
+    return subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def load_test(url, levels, rounds, think, seed, timeout, log=sys.stderr):
+    # One session first, so the workbook is loaded and indexed before timing
+    asyncio.run(run_level(url, 1, rounds=0, seed=seed, timeout=timeout))
+    print(f"{'sessions':>8} {'actions':>8} {'actions/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'failed':>7}",
+          file=log)
+    results = []
+    for sessions in levels:
+        level = asyncio.run(run_level(url, sessions, rounds, think, seed, timeout))
+        results.append(level)
+        latency = level["latency"]
+        print(f"{sessions:>8} {level['actions']:>8} {level['actions_per_s'] or 0:>10.1f} "
+              f"{latency['p50_ms'] or 0:>9.1f} {latency['p95_ms'] or 0:>9.1f} {latency['p99_ms'] or 0:>9.1f} "
+              f"{level['failed']:>7}", file=log)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--app", default=DEFAULT_APP, help=f"app script to serve (default {DEFAULT_APP})")
+    parser.add_argument("--url", help="test a server already running here instead of starting one")
+    parser.add_argument("--sessions", default=DEFAULT_SESSIONS,
+                        help=f"comma-separated concurrency levels (default {DEFAULT_SESSIONS})")
+    parser.add_argument("--rounds", type=int, default=2, help="scenario rounds per session (default 2)")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="mean pause in seconds between rounds (default 0: back to back)")
+    parser.add_argument("--filter-mode", choices=["live", "apply"], default="live",
+                        help="serve with filters applied as they change, or batched behind Apply (default live)")
+    parser.add_argument("--rows", help="serve a synthetic workbook of this many contact rows, e.g. 100k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for any one action")
+    parser.add_argument("-o", "--output", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    levels = [int(n) for n in args.sessions.split(",")]
+    output = os.path.abspath(args.output) if args.output else None
+    meta = {**run_metadata(args.seed), "app": args.app, "rounds": args.rounds, "think_s": args.think}
+    if not args.url:
+        meta["filter_mode"] = args.filter_mode
+
+    if args.url:
+        meta["url"] = args.url
+        results = load_test(args.url, levels, args.rounds, args.think, args.seed, args.timeout)
+    else:
+        workbook = ensure_workbook(parse_size(args.rows), args.seed) if args.rows else os.path.abspath(WORKBOOK_PATH)
+        meta["workbook"] = os.path.basename(workbook)
+        url = f"http://127.0.0.1:{args.port}"
+        app_path = os.path.abspath(args.app)
+        with app_workdir(workbook) as workdir:
+            log_path = os.path.join(workdir, "streamlit.log")
+            with open(log_path, "wb") as log:
+                process = start_server(app_path, workdir, args.port, log, args.filter_mode)
+                try:
+                    wait_for_server(url, process=process)
+                    results = load_test(url, levels, args.rounds, args.think, args.seed, args.timeout)
+                except RuntimeError:
+                    with open(log_path, encoding="utf-8", errors="replace") as fh:
+                        sys.stderr.write(fh.read())
+                    raise
+                finally:
+                    stop_server(process)
+
+    text = json.dumps({"meta": meta, "levels": results}, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 1 if any(level["failed"] for level in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
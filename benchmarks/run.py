@@ -0,0 +1,305 @@
+"""Stage timings for the publisher apps on synthetic workbooks.
+
+Times each stage an app rerun goes through, per workbook size:
+
+- load.*: ``pd.read_excel``, the streaming ingest the loader uses, and the
+  columnar snapshot.
+- clean.*: normalization, budget parsing, and the groupby with "; " joins.
+- index.*: building the filter indexes, and saving them next to the
+  snapshot and mapping them back, as a new process does.
+- filter.*: each sidebar filter alone, a keyword refined by one more
+  letter, fuzzy names, and all filters combined. The result cache is
+  bypassed, so these are cold costs.
+- export.*: ``DataFrame.to_excel`` as the apps used to call it, and every
+  ``export_bytes`` format.
+- render.*: a warm rerun of an app under Streamlit's AppTest. Only with
+  ``--render``.
+
+Results are one JSON document: run metadata plus one record per (size,
+stage) with min/median/mean/max seconds. ``--compare`` checks the medians
+against an earlier run and exits 1 when any stage got slower than the
+tolerance allows::
+
+    python -m benchmarks.run --sizes 1k,10k,100k -o bench.json
+    python -m benchmarks.run --sizes 1k,10k,100k --compare bench.json
+"""
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from benchmarks.generate import ensure_workbook, parse_size, size_label
+from publisher_core import export, ingest, snapshot
+from publisher_core.budget import parse_budgets
+from publisher_core.filters import FilterSpec, RefinementSession, filter_rows
+from publisher_core.index import PublisherIndex
+from publisher_core.loader import (
+    WORKBOOK_PATH, PublisherDataset, build_genres_list, file_digest, group_publishers, normalize_contacts,
+)
+
+DEFAULT_SIZES = "1k,10k,100k"
+# The filter defaults every app opens with
+DEFAULT_SELECTION = {"max_budget": 300_000}
+
+
+def time_stage(fn, min_time=0.2, min_repeats=3, max_repeats=50, max_total=10.0):
+    """Run ``fn`` repeatedly; returns ``(timings, last result)``.
+
+    Repeats until ``min_repeats`` runs and ``min_time`` seconds are both
+    reached, but stops at ``max_repeats`` runs or once ``max_total`` seconds
+    are spent, so slow stages on big workbooks run once or twice.
+    """
+    timings = []
+    result = None
+    while True:
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+        total = sum(timings)
+        if len(timings) >= max_repeats or total >= max_total:
+            break
+        if len(timings) >= min_repeats and total >= min_time:
+            break
+    return timings, result
+
+
+def summarize(timings):
+    return {
+        "repeats": len(timings),
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+        "max_s": max(timings),
+    }
+
+
+class Suite:
+    """Collects stage timings for one workbook size."""
+
+    def __init__(self, size, stages=None, log=sys.stderr):
+        self.size = size
+        self.stages = stages
+        self.log = log
+        self.results = []
+
+    def wanted(self, stage):
+        return not self.stages or any(stage == s or stage.startswith(s + ".") for s in self.stages)
+
+    def run(self, stage, fn, required=False, **timing):
+        """Time ``fn`` as ``stage`` if selected and return its result.
+
+        An unselected stage is skipped (returning None) unless later stages
+        need its result, in which case it runs once, untimed.
+        """
+        if not self.wanted(stage):
+            return fn() if required else None
+        timings, result = time_stage(fn, **timing)
+        record = {"size": size_label(self.size), "contact_rows": self.size, "stage": stage, **summarize(timings)}
+        self.results.append(record)
+        print(f"{record['size']:>6}  {stage:<28} {record['median_s'] * 1000:10.2f} ms  (x{record['repeats']})",
+              file=self.log)
+        return result
+
+
+# ─── Stages ─────────────────────────────────────────────────────────────────────
+
+
+def filter_cases(dataset):
+    """``(stage, filter_rows kwargs)`` for each sidebar filter on its own and combined."""
+    genres = [g for g in dataset.genres_list if g][:2]
+    return [
+        ("filter.genres", {"genres": genres}),
+        ("filter.platforms", {"platforms": ["pc", "console"]}),
+        ("filter.budget", {"max_budget": 300_000}),
+        ("filter.has_contact", {"only_with_contacts": True}),
+        ("filter.keyword", {"keyword": "studio"}),
+        ("filter.keyword_short", {"keyword": "st"}),
+        ("filter.fuzzy", {"keyword": "studos", "fuzzy": True}),
+        ("filter.combined", {
+            "genres": genres, "platforms": ["pc"], "max_budget": 1_000_000, "only_with_contacts": True,
+            "keyword": "games",
+        }),
+    ]
+
+
+def bench_filters(suite, dataset):
+    for stage, selection in filter_cases(dataset):
+        suite.run(stage, lambda: filter_rows(dataset, cache=None, **selection))
+
+    # Typing one more letter: the session only re-checks the previous result
+    previous = FilterSpec.normalize(keyword="stud")
+    previous_rows = filter_rows(dataset, *previous, cache=None)
+
+    def refine():
+        session = RefinementSession()
+        session.remember(dataset.version, previous, previous_rows)
+        return filter_rows(dataset, keyword="studi", cache=None, session=session)
+
+    suite.run("filter.keyword_refined", refine)
+
+
+def bench_exports(suite, dataset):
+    rows = filter_rows(dataset, cache=None, **DEFAULT_SELECTION)
+
+    def to_excel():
+        buffer = io.BytesIO()
+        dataset.grouped_df.iloc[rows].to_excel(buffer, index=False)
+        return buffer
+
+    suite.run("export.to_excel", to_excel)
+    for fmt in export.available_formats():
+        suite.run(f"export.{fmt}", lambda: export.export_bytes(dataset, rows, fmt, cache=None))
+
+
+@contextmanager
+def app_workdir(workbook):
+    """A scratch directory, made the working directory, with ``workbook`` as the master sheet.
+
+    The apps open the tag store in the working directory too, so nothing a
+    run writes lands in the real store.
+    """
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="publisher-bench-")
+    try:
+        os.symlink(os.path.abspath(workbook), os.path.join(workdir, WORKBOOK_PATH))
+        os.chdir(workdir)
+        yield workdir
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def bench_render(suite, workbook, app_path):
+    """Warm reruns of ``app_path`` with ``workbook`` as its master sheet."""
+    from streamlit.testing.v1 import AppTest
+
+    app_path = os.path.abspath(app_path)
+    with app_workdir(workbook):
+        app = AppTest.from_file(app_path, default_timeout=600)
+        app.run()  # loads and indexes the workbook, like a server's first session
+        if app.exception:
+            raise RuntimeError(f"{app_path} raised {app.exception[0].value}")
+        suite.run(f"render.{os.path.splitext(os.path.basename(app_path))[0]}", app.run, max_total=20.0)
+
+
+def bench_size(n_rows, seed=0, stages=None, render=None, log=sys.stderr):
+    suite = Suite(n_rows, stages, log)
+    workbook = ensure_workbook(n_rows, seed)
+
+    raw = suite.run("load.read_excel", lambda: pd.read_excel(workbook), required=True)
+    suite.run("load.stream_ingest", lambda: ingest.stream_publishers(workbook))
+    normalized = suite.run("clean.normalize", lambda: normalize_contacts(raw.copy()), required=True)
+    suite.run("clean.parse_budget", lambda: parse_budgets(raw["budget range"]))
+    grouped = suite.run("clean.groupby", lambda: group_publishers(normalized.copy()), required=True)
+    index = suite.run("index.build", lambda: PublisherIndex(grouped), required=True)
+
+    digest = file_digest(workbook)
+    genres_list = build_genres_list(grouped)
+    if snapshot.available():
+        suite.run("load.snapshot_write", lambda: snapshot.write_snapshot(workbook, digest, grouped, genres_list))
+        suite.run("load.snapshot_read", lambda: snapshot.read_snapshot(workbook, digest))
+        suite.run("index.write", lambda: snapshot.write_index(workbook, digest, index.state()))
+        suite.run("index.read", lambda: PublisherIndex(grouped, snapshot.read_index(workbook, digest)))
+
+    dataset = PublisherDataset(grouped, digest, genres_list, index.state())
+    bench_filters(suite, dataset)
+    bench_exports(suite, dataset)
+    if render:
+        for app_path in render:
+            bench_render(suite, workbook, app_path)
+
+    publishers = len(dataset)
+    for record in suite.results:
+        record["publishers"] = publishers
+    return suite.results
+
+
+# ─── Report ─────────────────────────────────────────────────────────────────────
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_metadata(seed):
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "seed": seed,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, tolerance=1.5):
+    """Stages whose median is over ``tolerance`` times the baseline's, slowest first.
+
+    Only stages present in both runs are compared.
+    """
+    before = {(r["size"], r["stage"]): r["median_s"] for r in baseline["results"]}
+    regressions = []
+    for record in results:
+        old = before.get((record["size"], record["stage"]))
+        if old and record["median_s"] > old * tolerance:
+            regressions.append({
+                "size": record["size"], "stage": record["stage"],
+                "baseline_s": old, "median_s": record["median_s"], "ratio": record["median_s"] / old,
+            })
+    return sorted(regressions, key=lambda r: r["ratio"], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated contact rows (default {DEFAULT_SIZES})")
+    parser.add_argument("--stages", help="comma-separated stages or groups to run, e.g. filter,export.csv")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--render", action="append", metavar="APP", help="also time warm reruns of APP (repeatable)")
+    parser.add_argument("-o", "--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if any stage regressed against this report")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown ratio for --compare")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",")] if args.stages else None
+    results = []
+    for size in args.sizes.split(","):
+        results.extend(bench_size(parse_size(size.strip()), args.seed, stages, args.render))
+    report = {"meta": run_metadata(args.seed), "results": results}
+
+    status = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            report["regressions"] = compare(results, json.load(fh), args.tolerance)
+        for r in report["regressions"]:
+            print(f"REGRESSION {r['size']} {r['stage']}: {r['baseline_s'] * 1000:.2f} ms -> "
+                  f"{r['median_s'] * 1000:.2f} ms ({r['ratio']:.2f}x)", file=sys.stderr)
+        status = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
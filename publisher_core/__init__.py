@@ -0,0 +1,13 @@
+"""Shared data layer for the Lodestar publisher apps."""
+
+from publisher_core.cache import RESULT_CACHE
+from publisher_core.filters import FilterSpec, RefinementSession, filter_mask, filter_rows, tagged_rows
+from publisher_core.loader import PLATFORM_LIST, WORKBOOK_PATH, PublisherDataset, load_publishers
+from publisher_core.store import NO_FOLLOWUP, STORE_PATH, CrmStore, open_store
+from publisher_core.tags import TAG_OPTIONS
+
+__all__ = [
+    "NO_FOLLOWUP", "PLATFORM_LIST", "RESULT_CACHE", "STORE_PATH", "TAG_OPTIONS", "WORKBOOK_PATH", "CrmStore",
+    "FilterSpec", "PublisherDataset", "RefinementSession", "filter_mask", "filter_rows", "load_publishers",
+    "open_store", "tagged_rows",
+]
@@ -0,0 +1,5 @@
+import sys
+
+from publisher_core.cli import main
+
+sys.exit(main())
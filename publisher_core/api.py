@@ -0,0 +1,408 @@
+"""Read-only HTTP/JSON API over the publisher dataset.
+
+Serves the sidebar's filters to other tools, from the same process-wide
+dataset, indexes and result cache the apps use:
+
+    GET /publishers?genres=rpg,strategy&platforms=pc&max_budget=500000
+                   &has_contact=1&keyword=studio&fields=Publisher,email&limit=50
+    GET /facets
+    GET /health
+    GET /metrics  (Prometheus text format, see ``publisher_core.metrics``)
+
+``genres`` and ``platforms`` take comma-separated or repeated values, with the
+sidebar's semantics (any of the genres, all of the platforms). ``fuzzy=1``
+ranks publisher names by typo-tolerant match on the keyword. A page holds
+``limit`` publishers; ``next_cursor`` in the response fetches the next one
+and is only valid for the same filters and dataset version. Any other
+parameter is rejected with a 400 that names it. Every response carries a
+weak ETag derived from the dataset version and the query (weak, because the
+gzipped and plain bodies share it), so a client repeating a request with
+If-None-Match gets a bodyless 304 until the workbook changes. Bodies are
+gzipped for clients that accept it. A workbook that can't be loaded gives a
+503, any other failure a 500, both with a JSON error body.
+
+``PublisherAPI.handle`` is a plain function of the request, so it can be
+called directly in tests; ``make_server`` wraps it in a threaded stdlib HTTP
+server, either as a sibling process::
+
+    python -m publisher_core.api --port 8502
+
+or inside a running app with ``serve_in_thread``.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import math
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from publisher_core import metrics
+from publisher_core.filters import FilterSpec, filter_rows
+from publisher_core.loader import PLATFORM_LIST, WORKBOOK_PATH, load_publishers
+
+FIELDS = ("Publisher", "URL", "Genres", "Platforms", "budget range", "Budget Min", "Budget Max", "Contact name", "email")
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1_000
+# Smaller bodies aren't worth the CPU
+GZIP_MIN_BYTES = 1_024
+JSON_TYPE = "application/json; charset=utf-8"
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off", ""}
+
+
+class QueryError(ValueError):
+    """A malformed request; reported to the client as 400."""
+
+    status = 400
+
+
+class CursorExpired(QueryError):
+    """A cursor from another query or an older version of the dataset."""
+
+    status = 410
+
+
+class DatasetUnavailable(RuntimeError):
+    """The workbook (or its snapshot) could not be loaded; reported as 503."""
+
+    status = 503
+
+
+# ─── Query Parsing ──────────────────────────────────────────────────────────────
+
+
+def _values(params, name):
+    return [v.strip() for raw in params.get(name, ()) for v in raw.split(",") if v.strip()]
+
+
+def _single(params, name, default=None):
+    values = params.get(name)
+    return values[-1] if values else default
+
+
+def _flag(params, name):
+    value = (_single(params, name) or "").strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    raise QueryError(f"{name} must be true or false, got {value!r}")
+
+
+def _integer(params, name, default, minimum=0, maximum=None):
+    value = _single(params, name)
+    if value is None or value == "":
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise QueryError(f"{name} must be an integer, got {value!r}") from None
+    if number < minimum or (maximum is not None and number > maximum):
+        bound = f"between {minimum} and {maximum}" if maximum is not None else f"at least {minimum}"
+        raise QueryError(f"{name} must be {bound}, got {number}")
+    return number
+
+
+FILTER_PARAMS = ("genres", "platforms", "max_budget", "has_contact", "keyword", "fuzzy")
+PAGE_PARAMS = ("fields", "limit", "cursor")
+
+
+def check_params(params, allowed):
+    """Raise ``QueryError`` naming any key of ``params`` not in ``allowed``.
+
+    A misspelled or unsupported filter would otherwise match everything.
+    """
+    unknown = sorted(set(params) - set(allowed))
+    if unknown:
+        raise QueryError(f"unknown key(s): {', '.join(unknown)} (expected any of {', '.join(allowed)})")
+
+
+def parse_filters(params):
+    """The ``FilterSpec`` selected by ``parse_qs``-style params (named in ``FILTER_PARAMS``)."""
+    return FilterSpec.normalize(
+        genres=_values(params, "genres"),
+        platforms=_values(params, "platforms"),
+        max_budget=_integer(params, "max_budget", None),
+        only_with_contacts=_flag(params, "has_contact"),
+        keyword=_single(params, "keyword", ""),
+        fuzzy=_flag(params, "fuzzy"),
+    )
+
+
+def parse_fields(params):
+    fields = tuple(_values(params, "fields")) or FIELDS
+    unknown = [f for f in fields if f not in FIELDS]
+    if unknown:
+        raise QueryError(f"unknown field(s): {', '.join(unknown)} (expected any of {', '.join(FIELDS)})")
+    return fields
+
+
+def parse_query(params):
+    """``(FilterSpec, fields, limit, cursor)`` from ``parse_qs``-style params."""
+    check_params(params, FILTER_PARAMS + PAGE_PARAMS)
+    spec = parse_filters(params)
+    fields = parse_fields(params)
+    limit = _integer(params, "limit", DEFAULT_LIMIT, minimum=1, maximum=MAX_LIMIT)
+    return spec, fields, limit, _single(params, "cursor")
+
+
+def _query_hash(version, spec):
+    return hashlib.blake2b(repr((version, spec)).encode("utf-8"), digest_size=6).hexdigest()
+
+
+def encode_cursor(version, spec, offset):
+    return f"{offset}.{_query_hash(version, spec)}"
+
+
+def decode_cursor(cursor, version, spec):
+    """The row offset a cursor points at; 0 for no cursor."""
+    if not cursor:
+        return 0
+    offset, _, check = cursor.partition(".")
+    if not offset.isdigit() or not check:
+        raise QueryError(f"malformed cursor {cursor!r}")
+    if check != _query_hash(version, spec):
+        raise CursorExpired("cursor belongs to another query or an older dataset; start again without it")
+    return int(offset)
+
+
+# ─── Responses ──────────────────────────────────────────────────────────────────
+
+
+def _json_value(value):
+    # JSON has no NaN or infinity; an open-ended budget comes back as null
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def json_columns(grouped_df, fields=FIELDS):
+    """``{field: [JSON-ready value per row]}`` for the whole table."""
+    return {field: [_json_value(v) for v in grouped_df[field].tolist()] for field in fields}
+
+
+def records(columns, rows, fields):
+    """The ``fields`` of ``rows`` as a list of dicts, from ``json_columns`` output."""
+    selected = [columns[field] for field in fields]
+    return [{field: values[row] for field, values in zip(fields, selected)} for row in rows.tolist()]
+
+
+class Response:
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = dict(headers or {})
+
+
+def _etag(version, *parts):
+    # Weak: the same ETag covers the gzipped and the plain body
+    digest = hashlib.blake2b(repr((version,) + parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _not_modified(if_none_match, etag):
+    # If-None-Match uses the weak comparison, which ignores the W/ prefix
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates or "*" in candidates
+
+
+def _json_response(payload, status=200, etag=None, accept_encoding=""):
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    headers = {"Content-Type": JSON_TYPE, "Vary": "Accept-Encoding"}
+    if etag:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = "no-cache"
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in accept_encoding.lower():
+        body = gzip.compress(body, compresslevel=5, mtime=0)
+        headers["Content-Encoding"] = "gzip"
+    return Response(status, body, headers)
+
+
+def _error(exc):
+    return _json_response({"error": str(exc)}, status=getattr(exc, "status", 400))
+
+
+def _internal_error(exc):
+    logging.getLogger("lodestar.api").error("request failed", exc_info=exc)
+    return _json_response({"error": "internal server error"}, status=500)
+
+
+# ─── Application ────────────────────────────────────────────────────────────────
+
+
+class PublisherAPI:
+    """The request handler, independent of any HTTP server.
+
+    By default each request uses ``load_publishers(path)``, so the API picks up
+    a changed workbook like the apps do; pass ``dataset`` to pin one.
+    """
+
+    def __init__(self, path=WORKBOOK_PATH, dataset=None):
+        self.path = path
+        self._dataset = dataset
+        self._routes = {
+            "/publishers": self.publishers, "/facets": self.facets, "/health": self.health, "/metrics": self.metrics,
+        }
+        self._columns = (None, None)
+        self._columns_lock = threading.Lock()
+
+    def dataset(self):
+        if self._dataset is not None:
+            return self._dataset
+        try:
+            return load_publishers(self.path)
+        except Exception as exc:
+            raise DatasetUnavailable(f"could not load {self.path}: {exc}") from exc
+
+    def columns(self, dataset):
+        """The dataset's fields as plain Python lists, built once per dataset version.
+
+        Serializing a page then costs a list lookup per value instead of a
+        pandas ``iloc`` and conversion per request.
+        """
+        version, columns = self._columns
+        if version != dataset.version:
+            with self._columns_lock:
+                version, columns = self._columns
+                if version != dataset.version:
+                    columns = json_columns(dataset.grouped_df)
+                    self._columns = (dataset.version, columns)
+        return columns
+
+    def handle(self, method, target, headers=None):
+        """Answer one request; ``target`` is the path with its query string."""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        url = urlsplit(target)
+        route = self._routes.get(url.path.rstrip("/") or "/")
+        if route is None:
+            return _json_response({"error": f"no such endpoint {url.path!r}"}, status=404)
+        if method not in ("GET", "HEAD"):
+            response = _json_response({"error": f"{method} not allowed"}, status=405)
+            response.headers["Allow"] = "GET, HEAD"
+            return response
+        try:
+            return route(parse_qs(url.query, keep_blank_values=True), headers)
+        except (QueryError, DatasetUnavailable) as exc:
+            return _error(exc)
+        except Exception as exc:
+            return _internal_error(exc)
+
+    def publishers(self, params, headers):
+        dataset = self.dataset()
+        spec, fields, limit, cursor = parse_query(params)
+        # Decided before filtering, so a revalidation costs no more than parsing
+        etag = _etag(dataset.version, spec, fields, limit, cursor)
+        if _not_modified(headers.get("if-none-match"), etag):
+            return Response(304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+
+        offset = decode_cursor(cursor, dataset.version, spec)
+        rows = filter_rows(dataset, *spec)
+        page = rows[offset:offset + limit]
+        end = offset + len(page)
+        payload = {
+            "version": dataset.version,
+            "total": len(rows),
+            "count": len(page),
+            "next_cursor": encode_cursor(dataset.version, spec, end) if end < len(rows) else None,
+            "items": records(self.columns(dataset), page, fields),
+        }
+        return _json_response(payload, etag=etag, accept_encoding=headers.get("accept-encoding", ""))
+
+    def facets(self, params, headers):
+        dataset = self.dataset()
+        etag = _etag(dataset.version, "facets")
+        if _not_modified(headers.get("if-none-match"), etag):
+            return Response(304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+        payload = {
+            "version": dataset.version,
+            "publishers": len(dataset),
+            "genres": list(dataset.genres_list),
+            "platforms": [p.lower() for p in PLATFORM_LIST],
+            "fields": list(FIELDS),
+        }
+        return _json_response(payload, etag=etag, accept_encoding=headers.get("accept-encoding", ""))
+
+    def health(self, params, headers):
+        return _json_response({"status": "ok", "version": self.dataset().version})
+
+    def metrics(self, params, headers):
+        return Response(200, metrics.render_metrics().encode("utf-8"), {"Content-Type": metrics.CONTENT_TYPE})
+
+
+# ─── HTTP Server ────────────────────────────────────────────────────────────────
+
+
+def _handler_class(api):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "LodestarPublisherAPI"
+        # Headers and body go out in separate writes; with Nagle on, keep-alive
+        # clients wait out a delayed ACK on every request
+        disable_nagle_algorithm = True
+
+        def _respond(self, send_body):
+            response = api.handle(self.command, self.path, dict(self.headers.items()))
+            self.send_response(response.status)
+            for name, value in response.headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(response.body)))
+            self.end_headers()
+            if send_body and response.body:
+                self.wfile.write(response.body)
+
+        def do_GET(self):
+            self._respond(send_body=True)
+
+        def do_HEAD(self):
+            self._respond(send_body=False)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def make_server(host="127.0.0.1", port=8502, api=None):
+    """A threaded HTTP server for ``api`` (a default ``PublisherAPI`` if omitted)."""
+    server = ThreadingHTTPServer((host, port), _handler_class(api or PublisherAPI()))
+    server.daemon_threads = True
+    return server
+
+
+def serve_in_thread(host="127.0.0.1", port=8502, api=None):
+    """Start the API on a daemon thread of the current process; returns the server."""
+    server = make_server(host, port, api)
+    threading.Thread(target=server.serve_forever, name="publisher-api", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m publisher_core.api", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--workbook", default=WORKBOOK_PATH)
+    args = parser.parse_args(argv)
+
+    api = PublisherAPI(args.workbook)
+    dataset = api.dataset()  # load and index before the first request
+    server = make_server(args.host, args.port, api)
+    print(f"Serving {len(dataset)} publishers on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Vectorized parsing of the free-text "budget range" column.
+
+The sheet writes budgets as ranges such as "< 250k", "+500k & < 1M" or a list
+of ranges like "< 250k, +250k & < 500k". Every amount is matched by a single
+compiled pattern, and the column is parsed once per distinct string rather
+than once per cell, since the same handful of ranges repeat across the sheet.
+
+Ranges are written from low to high, so the first amount gives the lower
+bound (0 when it is a cap: "< x", "up to x", "under x") and the last amount
+the upper bound (open, i.e. ``inf``, when it is a floor: "+x", "x+", "> x",
+"over x"). Amounts take a "k" or "m" unit; a string with any other unit word
+("1 mil") is left unparsed rather than read as a bare number.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+BUDGET_COLUMNS = ["Budget Min", "Budget Max", "Budget Status"]
+
+STATUS_OK = "ok"
+STATUS_BLANK = "blank"
+STATUS_UNPARSED = "unparsed"
+
+_CAP_OPS = ("<", "up to", "under", "below", "less than", "max", "maximum")
+_FLOOR_OPS = ("+", ">", "over", "above", "more than", "min", "minimum", "from")
+_WORD_OPS = "|".join(op for op in _CAP_OPS + _FLOOR_OPS if op.isalpha() or " " in op)
+_AMOUNT_RE = re.compile(
+    rf"(?P<op>[<>+]|\b(?:{_WORD_OPS})\b)?\s*(?P<amount>\d+(?:\.\d+)?)(?:\s*(?P<unit>[a-z]+))?(?P<plus>\+?)"
+)
+_THOUSANDS_SEP_RE = re.compile(r"(?<=\d),(?=\d{3}\b)")
+_UNIT_MULTIPLIER = {"": 1.0, "k": 1e3, "m": 1e6}
+# Words between two amounts ("100k to 300k"), not units of the first one
+_CONNECTORS = {"to", "and", "or"}
+
+
+def parse_budgets(values):
+    """Parse budget strings into a frame of Budget Min/Max/Status.
+
+    The result is aligned with ``values``. Blank or whitespace-only cells get
+    status "blank" and strings without a recognizable amount (e.g. "Open
+    ended", "1 mil") get "unparsed"; both keep a Budget Min of 0, so they
+    still pass the max-budget filter as they always have, and a Budget Max of
+    NaN.
+    """
+    values = pd.Series(values).reset_index(drop=True)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    if len(uniques) == 0:
+        return pd.DataFrame({
+            "Budget Min": np.zeros(len(values), dtype="int64"),
+            "Budget Max": np.full(len(values), np.nan),
+            "Budget Status": np.full(len(values), STATUS_BLANK, dtype=object),
+        })
+
+    text = (
+        pd.Series(uniques, dtype=object).astype(str).str.lower()
+        .str.replace(_THOUSANDS_SEP_RE, "", regex=True)
+    )
+    tokens = text.str.extractall(_AMOUNT_RE).fillna("")
+    n = len(uniques)
+    lower = np.zeros(n)
+    upper = np.full(n, np.nan)
+    status = np.full(n, STATUS_UNPARSED, dtype=object)
+
+    if len(tokens):
+        unit = tokens["unit"].where(~tokens["unit"].isin(_CONNECTORS), "")
+        amount = tokens["amount"].astype(float).to_numpy() * unit.map(_UNIT_MULTIPLIER).to_numpy()
+        op = tokens["op"].to_numpy()
+        cap = np.isin(op, _CAP_OPS)
+        floor = np.isin(op, _FLOOR_OPS) | (tokens["plus"].to_numpy() == "+")
+        owner = tokens.index.get_level_values(0).to_numpy()
+        match = tokens.index.get_level_values(1).to_numpy()
+
+        first = match == 0
+        lower[owner[first]] = np.where(cap[first], 0.0, amount[first])
+
+        last = np.r_[owner[1:] != owner[:-1], True]
+        upper[owner[last]] = np.where(floor[last], np.inf, amount[last])
+        status[owner[first]] = STATUS_OK
+
+        # An unknown unit makes the whole string unreadable, not just that amount
+        unknown = np.unique(owner[np.isnan(amount)])
+        lower[unknown] = 0.0
+        upper[unknown] = np.nan
+        status[unknown] = STATUS_UNPARSED
+
+    # Whitespace-only cells are as blank as empty ones
+    status[(text.str.strip() == "").to_numpy()] = STATUS_BLANK
+    blank = codes == -1
+    safe_codes = np.where(blank, 0, codes)
+    return pd.DataFrame({
+        "Budget Min": np.where(blank, 0, lower[safe_codes]).astype("int64"),
+        "Budget Max": np.where(blank, np.nan, upper[safe_codes]),
+        "Budget Status": np.where(blank, STATUS_BLANK, status[safe_codes]),
+    })
+
+
+def add_budget_columns(grouped_df):
+    """Parse "budget range" and insert the budget columns right after it."""
+    parsed = parse_budgets(grouped_df["budget range"])
+    parsed.index = grouped_df.index
+    grouped_df = grouped_df.drop(columns=BUDGET_COLUMNS, errors="ignore")
+    position = grouped_df.columns.get_loc("budget range") + 1
+    for offset, column in enumerate(BUDGET_COLUMNS):
+        grouped_df.insert(position + offset, column, parsed[column])
+    return grouped_df
+
@@ -0,0 +1,90 @@
+"""Process-wide LRU cache of filter results.
+
+Everyone with the same sidebar state gets the same rows, so results are kept
+once per process, keyed by the dataset version and the normalized filters.
+Only the matching row ids are stored (a few bytes per publisher), never
+DataFrame copies, and the total size is capped in bytes. The same LRU also
+backs the export cache, whose entries are the generated file bytes.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Rough per-entry bookkeeping (key tuple, dict slot, array header)
+_ENTRY_OVERHEAD = 256
+
+
+def _nbytes(value):
+    return value.nbytes if isinstance(value, np.ndarray) else len(value)
+
+
+class ResultCache:
+    def __init__(self, max_bytes=32 << 20):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            rows = self._entries.get(key)
+            if rows is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows
+
+    def put(self, key, rows):
+        """Store ``rows``, a row-id array (made read-only, since every caller shares it) or bytes."""
+        if isinstance(rows, np.ndarray):
+            rows.setflags(write=False)
+        size = _nbytes(rows) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return rows
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= _nbytes(old) + _ENTRY_OVERHEAD
+            self._entries[key] = rows
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= _nbytes(evicted) + _ENTRY_OVERHEAD
+                self.evictions += 1
+        return rows
+
+    def get_or_compute(self, key, compute):
+        rows = self.get(key)
+        if rows is None:
+            rows = self.put(key, compute())
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+RESULT_CACHE = ResultCache()
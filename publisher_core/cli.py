@@ -0,0 +1,250 @@
+"""Command-line queries over the publisher dataset, without Streamlit.
+
+One query, from flags, streamed to stdout or a file::
+
+    python -m publisher_core query --genre rpg --platform pc --max-budget 500000 \\
+        --has-contact --fields Publisher,"Contact name",email --explode -o rpg_pc.csv
+
+Many saved queries, one per line of a file, either as a JSON object or in
+the HTTP API's query-string form (blank lines and ``#`` comments skipped)::
+
+    {"name": "rpg-pc", "genres": ["rpg"], "platforms": ["pc"], "has_contact": true}
+    genres=strategy&max_budget=300000&keyword=studio
+
+    python -m publisher_core batch nightly.jsonl --out-dir exports/ --format csv
+
+The workbook is loaded and indexed once for the whole invocation, and
+identical queries share a result through the filter cache. With
+``--out-dir`` each query gets its own file, named after its ``name`` (or its
+line number); without it every match goes to one stream on stdout with a
+leading ``query`` column. The filters mean what they do in the apps' sidebar.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from urllib.parse import parse_qs
+
+from publisher_core.api import FIELDS, FILTER_PARAMS, QueryError, check_params, parse_fields, parse_filters
+from publisher_core.export import CHUNK_ROWS, FORMATS, available_formats, encode_frames, iter_frames, stream_export
+from publisher_core.filters import filter_rows
+from publisher_core.loader import WORKBOOK_PATH, load_publishers
+
+DEFAULT_FIELDS = ("Publisher", "URL", "Genres", "Platforms", "budget range", "Contact name", "email")
+
+
+class Query:
+    def __init__(self, name, spec, fields):
+        self.name = name
+        self.spec = spec
+        self.fields = fields
+
+
+# ─── Query Files ────────────────────────────────────────────────────────────────
+
+
+def _as_params(obj):
+    """A JSON query object as ``parse_qs``-style params."""
+    params = {}
+    for key, value in obj.items():
+        if isinstance(value, bool):
+            value = "1" if value else "0"
+        elif isinstance(value, (list, tuple)):
+            value = ",".join(str(v) for v in value)
+        elif value is None:
+            continue
+        params[key] = [str(value)]
+    return params
+
+
+def parse_query_line(line, default_name, default_fields=DEFAULT_FIELDS):
+    """A ``Query`` from one line of a query file."""
+    line = line.strip()
+    if line.startswith("{"):
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise QueryError(f"invalid JSON: {exc}") from None
+        params = _as_params(obj)
+    else:
+        params = parse_qs(line, keep_blank_values=True)
+    name = (params.pop("name", None) or [default_name])[-1]
+    check_params(params, ("name", "fields") + FILTER_PARAMS)
+    fields = parse_fields(params) if "fields" in params else default_fields
+    return Query(name, parse_filters(params), fields)
+
+
+def read_queries(lines, default_fields=DEFAULT_FIELDS):
+    """``Query`` objects from the lines of a query file; errors name the line."""
+    queries = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        try:
+            queries.append(parse_query_line(line, f"query-{number}", default_fields))
+        except QueryError as exc:
+            raise QueryError(f"line {number}: {exc}") from None
+    return queries
+
+
+# ─── Output ─────────────────────────────────────────────────────────────────────
+
+
+def _file_name(name, ext, taken):
+    stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("._") or "query"
+    candidate, n = stem, 1
+    while candidate in taken:
+        n += 1
+        candidate = f"{stem}-{n}"
+    taken.add(candidate)
+    return f"{candidate}.{ext}"
+
+
+def _write(chunks, out):
+    for chunk in chunks:
+        out.write(chunk)
+
+
+def run_to_dir(dataset, queries, out_dir, fmt="csv", explode=False, log=sys.stderr):
+    """Write each query's matches to its own file in ``out_dir``; returns the match counts."""
+    os.makedirs(out_dir, exist_ok=True)
+    ext = FORMATS[fmt][0]
+    taken = set()
+    counts = []
+    for query in queries:
+        rows = filter_rows(dataset, *query.spec)
+        path = os.path.join(out_dir, _file_name(query.name, ext, taken))
+        with open(path, "wb") as out:
+            _write(stream_export(dataset, rows, fmt, explode, columns=query.fields), out)
+        counts.append(len(rows))
+        print(f"{query.name}: {len(rows)} publishers -> {path}", file=log)
+    return counts
+
+
+def run_to_stream(dataset, queries, out, fmt="csv", explode=False, fields=DEFAULT_FIELDS):
+    """Write every query's matches to ``out`` as one file, with a leading ``query`` column.
+
+    All queries share ``fields`` here, so the columns line up.
+    """
+    counts = []
+
+    def frames():
+        emitted = False
+        for query in queries:
+            rows = filter_rows(dataset, *query.spec)
+            counts.append(len(rows))
+            for frame in iter_frames(dataset, rows, explode, CHUNK_ROWS, fields):
+                # Empty results add nothing, but the stream still needs a header
+                if len(frame) or not emitted:
+                    emitted = True
+                    yield frame.assign(query=query.name)[["query", *fields]]
+
+    _write(encode_frames(frames(), fmt), out)
+    return counts
+
+
+# ─── Entry Point ────────────────────────────────────────────────────────────────
+
+
+def _field_list(value):
+    try:
+        return parse_fields({"fields": [value]})
+    except QueryError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m publisher_core", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workbook", default=WORKBOOK_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--format", default="csv", choices=available_formats())
+    output.add_argument("--fields", type=_field_list, default=DEFAULT_FIELDS,
+                        help=f"comma-separated columns, from: {', '.join(FIELDS)}")
+    output.add_argument("--explode", action="store_true", help="one row per contact instead of per publisher")
+
+    query = commands.add_parser("query", parents=[output], help="run one query given as flags")
+    query.add_argument("--genre", action="append", default=[], help="match any of these (repeatable)")
+    query.add_argument("--platform", action="append", default=[], help="require all of these (repeatable)")
+    query.add_argument("--max-budget", type=int)
+    query.add_argument("--has-contact", action="store_true")
+    query.add_argument("--keyword", default="")
+    query.add_argument("--fuzzy", action="store_true")
+    query.add_argument("-o", "--output", default="-", help="file to write (default: stdout)")
+
+    batch = commands.add_parser("batch", parents=[output], help="run every query in a file")
+    batch.add_argument("queries", help="query file, one JSON object or query string per line ('-' for stdin)")
+    batch.add_argument("--out-dir", help="write one file per query here instead of one stream to stdout")
+
+    serve = commands.add_parser("serve", help="start the HTTP API")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8502)
+    return parser
+
+
+def _run_to_output(dataset, queries, args):
+    """Write a ``query`` to ``--output`` or a stdout ``batch``; returns the match counts."""
+    path = getattr(args, "output", "-")
+    out = sys.stdout.buffer if path == "-" else open(path, "wb")
+    try:
+        if args.command == "query":
+            rows = filter_rows(dataset, *queries[0].spec)
+            _write(stream_export(dataset, rows, args.format, args.explode, columns=args.fields), out)
+            return [len(rows)]
+        return run_to_stream(dataset, queries, out, args.format, args.explode, args.fields)
+    finally:
+        if out is sys.stdout.buffer:
+            out.flush()
+        else:
+            out.close()
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        from publisher_core import api
+
+        return api.main(["--host", args.host, "--port", str(args.port), "--workbook", args.workbook])
+
+    started = time.perf_counter()
+    if args.command == "query":
+        params = {
+            "genres": [",".join(args.genre)],
+            "platforms": [",".join(args.platform)],
+            "max_budget": ["" if args.max_budget is None else str(args.max_budget)],
+            "has_contact": ["1" if args.has_contact else "0"],
+            "keyword": [args.keyword],
+            "fuzzy": ["1" if args.fuzzy else "0"],
+        }
+        queries = [Query("query", parse_filters(params), args.fields)]
+    else:
+        try:
+            if args.queries == "-":
+                queries = read_queries(sys.stdin, args.fields)
+            else:
+                with open(args.queries, encoding="utf-8") as fh:
+                    queries = read_queries(fh, args.fields)
+        except (OSError, QueryError) as exc:
+            parser.error(str(exc))
+
+    dataset = load_publishers(args.workbook)
+    try:
+        if args.command == "batch" and args.out_dir:
+            counts = run_to_dir(dataset, queries, args.out_dir, args.format, args.explode)
+        else:
+            counts = _run_to_output(dataset, queries, args)
+    except BrokenPipeError:
+        # The reader (``| head``) went away; don't let the final flush complain too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+    elapsed = time.perf_counter() - started
+    print(f"{len(queries)} quer{'y' if len(queries) == 1 else 'ies'}, {sum(counts)} rows in {elapsed:.2f}s",
+          file=sys.stderr)
+    return 0
@@ -0,0 +1,256 @@
+"""Exports of a filter result: XLSX, CSV (optionally gzipped), Parquet and JSON Lines.
+
+The apps used to run ``DataFrame.to_excel`` into a ``BytesIO`` on every rerun
+so the download button had something to hold, which was a full XLSX
+serialization per keystroke that was almost never used. ``lazy_export`` gives
+the button a callable instead; Streamlit only calls it on click. The bytes
+are cached process-wide by (dataset version, rows, format, explode), so the
+same download by a colleague or a second click is free.
+
+Every format is produced by ``stream_export``, which walks the row ids in
+chunks of ``CHUNK_ROWS`` and yields encoded bytes as it goes, so memory stays
+flat and the first bytes are out before the last rows are read. CSV and JSON
+Lines stream chunk by chunk, gzip compresses incrementally, and Parquet
+writes one row group per chunk. XLSX goes through openpyxl's write-only mode,
+but the format can only be handed out whole.
+
+With ``explode=True`` the "; "-joined Contact name and email columns are
+split back into one row per contact, for mail merges.
+
+    for chunk in stream_export(dataset, rows, "csv.gz", explode=True):
+        out.write(chunk)
+"""
+
+import hashlib
+import io
+import math
+import time
+import zlib
+from itertools import zip_longest
+
+import numpy as np
+from openpyxl import Workbook
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - Parquet export needs pyarrow
+    pa = None
+
+from publisher_core import metrics
+from publisher_core.cache import ResultCache
+from publisher_core.timing import log_event
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# format -> (file extension, MIME type)
+FORMATS = {
+    "xlsx": ("xlsx", XLSX_MIME),
+    "csv": ("csv", "text/csv"),
+    "csv.gz": ("csv.gz", "application/gzip"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "jsonl": ("jsonl", "application/x-ndjson"),
+}
+
+CHUNK_ROWS = 5_000
+CONTACT_SEPARATOR = "; "
+
+# Generated files, shared by every session in the process
+EXPORT_CACHE = ResultCache(max_bytes=64 << 20)
+
+
+class ExportError(ValueError):
+    pass
+
+
+def available_formats():
+    return [fmt for fmt in FORMATS if fmt != "parquet" or pa is not None]
+
+
+def rows_key(rows):
+    """Short fingerprint of a row-id array (order included)."""
+    return hashlib.blake2b(rows.tobytes(), digest_size=16).hexdigest()
+
+
+def explode_contacts(frame):
+    """One row per contact instead of one per publisher.
+
+    The grouped table de-duplicates names and emails separately, so they are
+    paired by position; a publisher with more emails than names gets blank
+    names for the extras (and the other way round). Publishers without any
+    contact keep a single row.
+    """
+    pairs = []
+    for names, emails in zip(frame["Contact name"].tolist(), frame["email"].tolist()):
+        contacts = zip_longest(
+            names.split(CONTACT_SEPARATOR) if names else [],
+            emails.split(CONTACT_SEPARATOR) if emails else [],
+            fillvalue="",
+        )
+        pairs.append(list(contacts) or [("", "")])
+    counts = [len(p) for p in pairs]
+    exploded = frame.iloc[np.repeat(np.arange(len(frame)), counts)].reset_index(drop=True)
+    exploded["Contact name"] = [name for p in pairs for name, _ in p]
+    exploded["email"] = [email for p in pairs for _, email in p]
+    return exploded
+
+
+def iter_frames(dataset, rows, explode=False, chunk_rows=CHUNK_ROWS, columns=None):
+    """``grouped_df.iloc[rows]`` in chunks of ``chunk_rows`` publishers.
+
+    ``columns`` optionally selects and orders the columns. Always yields at
+    least one (possibly empty) frame, so writers can emit a header for an
+    empty result.
+    """
+    grouped_df = dataset.grouped_df
+    for start in range(0, max(len(rows), 1), chunk_rows):
+        frame = grouped_df.iloc[rows[start:start + chunk_rows]]
+        if explode:
+            frame = explode_contacts(frame)
+        yield frame if columns is None else frame[list(columns)]
+
+
+class _Spool:
+    """Write-only file object that hands back what was written since the last ``drain``."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+# ─── Writers ────────────────────────────────────────────────────────────────────
+
+
+def _xlsx_cell(value):
+    # Same representation as DataFrame.to_excel: blank for NaN, "inf" for inf
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if math.isinf(value):
+            return "inf" if value > 0 else "-inf"
+    return value
+
+
+def iter_xlsx(frames, sheet_name="Sheet1"):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    header = True
+    for frame in frames:
+        if header:
+            sheet.append(list(frame.columns))
+            header = False
+        for values in frame.itertuples(index=False, name=None):
+            sheet.append([_xlsx_cell(v) for v in values])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    yield buffer.getvalue()
+
+
+def iter_csv(frames):
+    header = True
+    for frame in frames:
+        yield frame.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+
+
+def iter_gzip(chunks, level=6):
+    # wbits=31 writes the gzip container rather than a bare zlib stream
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_jsonl(frames):
+    for frame in frames:
+        if len(frame):
+            text = frame.to_json(orient="records", lines=True, force_ascii=False)
+            yield (text if text.endswith("\n") else text + "\n").encode("utf-8")
+
+
+def iter_parquet(frames):
+    if pa is None:
+        raise ExportError("Parquet export needs pyarrow (pip install pyarrow)")
+    spool = _Spool()
+    writer = None
+    schema = None
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(spool, schema)
+            writer.write_table(table)
+            data = spool.drain()
+            if data:
+                yield data
+    finally:
+        if writer is not None:
+            writer.close()
+    yield spool.drain()
+
+
+def encode_frames(frames, fmt="csv"):
+    """Yield ``frames`` (same columns, in order) encoded as one ``fmt`` file."""
+    if fmt not in FORMATS:
+        raise ExportError(f"unknown export format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    if fmt == "xlsx":
+        return iter_xlsx(frames)
+    if fmt == "csv":
+        return iter_csv(frames)
+    if fmt == "csv.gz":
+        return iter_gzip(iter_csv(frames))
+    if fmt == "parquet":
+        return iter_parquet(frames)
+    return iter_jsonl(frames)
+
+
+def stream_export(dataset, rows, fmt="csv", explode=False, chunk_rows=CHUNK_ROWS, columns=None):
+    """Yield the ``fmt`` export of ``grouped_df.iloc[rows]`` as a sequence of bytes."""
+    if fmt not in FORMATS:
+        raise ExportError(f"unknown export format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    return encode_frames(iter_frames(dataset, rows, explode, chunk_rows, columns), fmt)
+
+
+def export_bytes(dataset, rows, fmt="xlsx", explode=False, cache=EXPORT_CACHE):
+    """The whole ``fmt`` export of ``grouped_df.iloc[rows]``, from ``cache`` when possible."""
+
+    def build():
+        started = time.perf_counter()
+        data = b"".join(stream_export(dataset, rows, fmt, explode))
+        seconds = time.perf_counter() - started
+        log_event("export", seconds, format=fmt, rows=len(rows), explode=bool(explode), bytes=len(data))
+        metrics.observe_export(fmt, seconds, len(data))
+        return data
+
+    if cache is None:
+        return build()
+    return cache.get_or_compute((dataset.version, rows_key(rows), fmt, bool(explode)), build)
+
+
+def lazy_export(dataset, rows, fmt="xlsx", explode=False, cache=EXPORT_CACHE):
+    """Zero-argument callable for ``st.download_button(data=...)``."""
+    return lambda: export_bytes(dataset, rows, fmt, explode, cache)
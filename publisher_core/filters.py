@@ -0,0 +1,192 @@
+"""The sidebar filter chain, evaluated against a dataset's indexes.
+
+Every filter is a boolean mask over the grouped table's rows, so the whole
+selection is combined without building intermediate DataFrames; callers take
+a single ``grouped_df[mask]`` (or ``iloc`` on the row ids) at the end. The
+keyword runs last, through the trigram index, and only verifies rows that
+survived the other filters. In fuzzy mode the keyword is instead matched
+against publisher names with typo tolerance, and results come back ranked.
+
+``filter_rows`` normalizes the selection into a ``FilterSpec`` and serves
+repeated selections from the process-wide result cache. Given a session's
+``RefinementSession`` it also notices when a new selection can only narrow
+the previous one (a longer keyword, a lower budget, one more required
+platform, ...) and then only re-checks the previous result's rows.
+``tagged_rows`` maps publishers found through the store's tag index back to
+row ids, within a filter result.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from publisher_core.cache import RESULT_CACHE
+
+
+_SPEC_FIELDS = ["genres", "platforms", "max_budget", "only_with_contacts", "keyword", "fuzzy"]
+
+
+class FilterSpec(namedtuple("FilterSpec", _SPEC_FIELDS)):
+    """A hashable, normalized sidebar selection.
+
+    Order and case of multiselect values don't matter, and neither does
+    surrounding whitespace in the keyword, so equivalent selections share a
+    cache entry.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def normalize(cls, genres=(), platforms=(), max_budget=None, only_with_contacts=False, keyword="",
+                  fuzzy=False):
+        keyword = (keyword or "").strip().lower()
+        return cls(
+            tuple(sorted({g.strip().lower() for g in genres})),
+            tuple(sorted({p.strip().lower() for p in platforms})),
+            max_budget,
+            bool(only_with_contacts),
+            keyword,
+            bool(fuzzy and keyword),
+        )
+
+
+def filter_mask(dataset, genres=(), platforms=(), max_budget=None, only_with_contacts=False, keyword=""):
+    """Mask of publishers matching the sidebar selection.
+
+    Genres match if the publisher has any of the selected ones; platforms only
+    if it has all of them. A budget matches when its range overlaps
+    ``[0, max_budget]``, i.e. when its Budget Min is at most ``max_budget``;
+    blank and unparsed budgets have a Budget Min of 0 and always match. The
+    keyword is a case-insensitive substring of the publisher's name, genres,
+    platforms, contacts, emails or URL.
+    """
+    index = dataset.index
+    mask = np.ones(index.size, dtype=bool)
+    if genres:
+        mask &= index.genres.any_of(genres)
+    if platforms:
+        mask &= index.platforms.all_of(platforms)
+    if max_budget is not None:
+        mask &= index.budget_min <= max_budget
+    if only_with_contacts:
+        mask &= index.has_contact
+    if keyword and keyword.strip():
+        rows = index.text.search(keyword, within=mask)
+        mask = np.zeros(index.size, dtype=bool)
+        mask[rows] = True
+    return mask
+
+
+def is_refinement(previous, current):
+    """True if every publisher matching ``current`` also matches ``previous``."""
+    if previous.fuzzy or current.fuzzy:
+        # Fuzzy ranking isn't monotonic in the keyword
+        return False
+    if previous.genres and not (current.genres and set(current.genres) <= set(previous.genres)):
+        return False
+    if not set(previous.platforms) <= set(current.platforms):
+        return False
+    if previous.max_budget is not None and (current.max_budget is None or current.max_budget > previous.max_budget):
+        return False
+    if previous.only_with_contacts and not current.only_with_contacts:
+        return False
+    return previous.keyword in current.keyword
+
+
+class RefinementSession:
+    """One user's last result, reused when their next selection narrows it.
+
+    Keep one per Streamlit session (in ``st.session_state``); it only holds a
+    reference to the cached row-id array.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.spec = None
+        self.rows = None
+        self.refinements = 0
+
+    def base_rows(self, version, spec):
+        if self.rows is None or version != self.version or not is_refinement(self.spec, spec):
+            return None
+        self.refinements += 1
+        return self.rows
+
+    def remember(self, version, spec, rows):
+        self.version, self.spec, self.rows = version, spec, rows
+
+
+def filter_rows(dataset, genres=(), platforms=(), max_budget=None, only_with_contacts=False, keyword="",
+                fuzzy=False, cache=RESULT_CACHE, session=None):
+    """Row ids of matching publishers, for ``grouped_df.iloc``.
+
+    Rows are in table (alphabetical) order, except with ``fuzzy`` and a
+    keyword, where the closest name matches come first. The returned array is
+    shared through ``cache`` and read-only; pass ``cache=None`` to bypass it.
+    """
+    spec = FilterSpec.normalize(genres, platforms, max_budget, only_with_contacts, keyword, fuzzy)
+    key = (dataset.version, spec)
+    rows = cache.get(key) if cache is not None else None
+    if rows is None:
+        base = session.base_rows(dataset.version, spec) if session is not None else None
+        rows = run_filters(dataset, spec, within=base)
+        if cache is not None:
+            rows = cache.put(key, rows)
+    if session is not None:
+        session.remember(dataset.version, spec, rows)
+    return rows
+
+
+def run_filters(dataset, spec, within=None):
+    """Evaluate ``spec``, optionally only over the sorted row ids ``within``."""
+    if spec.fuzzy:
+        mask = filter_mask(dataset, spec.genres, spec.platforms, spec.max_budget, spec.only_with_contacts)
+        return dataset.index.names.lookup(spec.keyword, within=mask)
+    if within is None:
+        return np.flatnonzero(filter_mask(
+            dataset, spec.genres, spec.platforms, spec.max_budget, spec.only_with_contacts, spec.keyword
+        ))
+
+    index = dataset.index
+    rows = within
+    keep = np.ones(len(rows), dtype=bool)
+    if spec.genres:
+        keep &= index.genres.any_of(spec.genres, rows)
+    if spec.platforms:
+        keep &= index.platforms.all_of(spec.platforms, rows)
+    if spec.max_budget is not None:
+        keep &= index.budget_min[rows] <= spec.max_budget
+    if spec.only_with_contacts:
+        keep &= index.has_contact[rows]
+    rows = rows[keep]
+    if spec.keyword:
+        rows = index.text.search(spec.keyword, rows=rows)
+    return rows
+
+
+def _members(values, sorted_pool):
+    """Mask of the ``values`` present in the sorted array ``sorted_pool``."""
+    if not len(sorted_pool):
+        return np.zeros(len(values), dtype=bool)
+    found = np.minimum(np.searchsorted(sorted_pool, values), len(sorted_pool) - 1)
+    return sorted_pool[found] == values
+
+
+def tagged_rows(dataset, publisher_ids, within=None):
+    """Row ids of the publishers with the given store ids, in table order.
+
+    ``within`` is an optional array of row ids (a ``filter_rows`` result)
+    limiting the rows returned. When it is sorted, as filter results are
+    unless fuzzy-ranked, the smaller of the two sides is binary-searched in
+    the other, so past one vectorized sortedness check the cost follows the
+    smaller side. A ranked ``within`` falls back to ``np.isin``.
+    """
+    rows = dataset.index.rows_for(publisher_ids)
+    if within is None:
+        return rows
+    within = np.asarray(within)
+    if len(within) > 1 and not (within[1:] > within[:-1]).all():
+        return rows[np.isin(rows, within)]
+    if len(rows) <= len(within):
+        return rows[_members(rows, within)]
+    return within[_members(within, rows)]
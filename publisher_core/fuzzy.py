@@ -0,0 +1,238 @@
+"""Typo-tolerant publisher name lookup.
+
+Names are reduced to keys without case, spaces or punctuation: the whole
+name, each word, and each pair of adjacent words ("11 Bit Studios" gives
+"11bitstudios", "11", "bit", "studios", "11bit", "bitstudios"), so "11bit",
+"11 Bit" and "11-bit" all land on the same key. A query's padded trigrams pick
+the keys with the highest Jaccard similarity from an inverted index, and only
+those few candidates are ranked by edit distance. A lookup costs a handful of
+numpy operations over posting lists instead of a Levenshtein pass over every
+publisher.
+
+Keys, their rows and the trigram postings are flat arrays, built with pandas
+and numpy and saved alongside the columnar snapshot.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from publisher_core.search import inverted_index, readonly, trigram_codes
+
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+# How many of the most similar keys get an exact edit-distance check
+_CANDIDATES = 200
+
+
+def collapse(text):
+    return _NON_ALNUM_RE.sub("", str(text).lower())
+
+
+def name_keys(name):
+    words = [w for w in _NON_ALNUM_RE.split(str(name).lower()) if w]
+    keys = {"".join(words)}
+    keys.update(words)
+    keys.update(a + b for a, b in zip(words, words[1:]))
+    keys.discard("")
+    return keys
+
+
+def padded_trigrams(key):
+    padded = f"${key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _match_masks(pattern):
+    masks = {}
+    for i, c in enumerate(pattern):
+        masks[c] = masks.get(c, 0) | (1 << i)
+    return masks
+
+
+def _edit_distances(masks, size, text, at):
+    """Edit distances from a pattern of length ``size`` to ``text[:at]`` and to ``text``.
+
+    Bit-parallel algorithm of Myers/Hyyrö: one pass over ``text`` with a few
+    integer operations per character, whatever the length of the pattern.
+    ``masks`` comes from :func:`_match_masks`, so a pattern compared against
+    many texts is prepared only once.
+    """
+    full, last = (1 << size) - 1, 1 << (size - 1)
+    pv, mv, score, prefix = full, 0, size, size
+    for j, c in enumerate(text, 1):
+        eq = masks.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+        if j == at:
+            prefix = score
+    return prefix, score
+
+
+def levenshtein(a, b, max_distance=None):
+    """Edit distance between ``a`` and ``b``.
+
+    With ``max_distance`` the result is capped at ``max_distance + 1``, so
+    anything above it reads as "too far".
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    distance = _edit_distances(_match_masks(b), len(b), a, 0)[1] if b else len(a)
+    return distance if max_distance is None else min(distance, max_distance + 1)
+
+
+def default_tolerance(query_key):
+    return max(1, min(3, len(query_key) // 3))
+
+
+def _key_table(names):
+    """Every (key, row) pair of :func:`name_keys`, as two aligned arrays."""
+    lowered = pd.Series(names, dtype=object).astype(str).str.lower().reset_index(drop=True)
+    words = lowered.str.split(_NON_ALNUM_RE).explode()
+    words = words[words.notna() & (words != "")]
+    word_rows = words.index.to_numpy(dtype=np.int64)
+    words = words.to_numpy(dtype=object)
+    adjacent = word_rows[1:] == word_rows[:-1]
+
+    keys = np.concatenate((
+        lowered.str.replace(_NON_ALNUM_RE, "", regex=True).to_numpy(dtype=object),
+        words,
+        words[:-1][adjacent] + words[1:][adjacent],
+    ))
+    rows = np.concatenate((np.arange(len(lowered), dtype=np.int64), word_rows, word_rows[:-1][adjacent]))
+    keep = keys != ""
+    return keys[keep], rows[keep]
+
+
+class FuzzyNameIndex:
+    def __init__(self, names):
+        keys, rows = _key_table(names)
+        key_ids, keys = pd.factorize(keys)
+        _, row_offsets, key_rows = inverted_index(key_ids, rows)
+
+        encoded = [f"${key}$".encode("ascii") for key in keys]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        text = np.frombuffer(b"\0".join(encoded) + b"\0", dtype=np.uint8)
+        codes, valid = trigram_codes(text)
+        owners = np.repeat(np.arange(len(encoded), dtype=np.int64), lengths + 1)[:len(codes)]
+        grams, offsets, postings = inverted_index(codes[valid], owners[valid])
+
+        starts = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(lengths + 1, out=starts[1:])
+        self._load({
+            "text": text, "starts": starts, "row_offsets": row_offsets, "rows": key_rows,
+            "gram_counts": np.bincount(postings, minlength=len(encoded)).astype(np.int32),
+            "grams": grams, "offsets": offsets, "postings": postings,
+        })
+
+    @classmethod
+    def from_state(cls, state):
+        index = cls.__new__(cls)
+        index._load(state)
+        return index
+
+    def state(self):
+        """The arrays :meth:`from_state` rebuilds the index from."""
+        return dict(self._state)
+
+    def _load(self, state):
+        self._state = {name: readonly(array) for name, array in state.items()}
+        self._text = state["text"].tobytes()
+        self._starts = state["starts"].tolist()
+        self.key_gram_counts = self._state["gram_counts"]
+        self._row_offsets = self._state["row_offsets"]
+        self._rows = self._state["rows"]
+        self._grams = self._state["grams"]
+        self._offsets = self._state["offsets"]
+        self._postings = self._state["postings"]
+
+    def __len__(self):
+        return len(self._starts) - 1
+
+    def key(self, key_id):
+        """The key with id ``key_id`` (without its ``$`` padding)."""
+        return self._text[self._starts[key_id] + 1:self._starts[key_id + 1] - 2].decode("ascii")
+
+    def candidates(self, query_key, limit=_CANDIDATES):
+        """Ids of the keys sharing the most trigrams with ``query_key``, best first."""
+        codes, _ = trigram_codes(np.frombuffer(f"${query_key}$".encode("ascii"), dtype=np.uint8))
+        codes = np.unique(codes)
+        found = np.searchsorted(self._grams, codes)
+        known = found < len(self._grams)
+        known[known] = self._grams[found[known]] == codes[known]
+        found = found[known]
+        lists = [self._postings[self._offsets[i]:self._offsets[i + 1]] for i in found]
+        if not lists:
+            return np.empty(0, dtype=np.int64)
+        shared = np.bincount(np.concatenate(lists), minlength=len(self))
+        key_ids = np.flatnonzero(shared)
+        shared = shared[key_ids]
+        jaccard = shared / (len(codes) + self.key_gram_counts[key_ids] - shared)
+        if len(key_ids) > limit:
+            top = np.argpartition(-jaccard, limit - 1)[:limit]
+            key_ids, jaccard = key_ids[top], jaccard[top]
+        return key_ids[np.lexsort((key_ids, -jaccard))]
+
+    def lookup(self, query, max_distance=None, within=None):
+        """Row ids whose name is within ``max_distance`` edits of ``query``, best first.
+
+        A key also matches when the query is a close prefix of it (so "devol"
+        finds "Devolver"), ranked after whole-key matches at the same
+        distance. ``within`` is an optional boolean mask over rows.
+        """
+        query_key = collapse(query)
+        if not query_key:
+            return np.empty(0, dtype=np.int64)
+        if max_distance is None:
+            max_distance = default_tolerance(query_key)
+
+        # Whole-key matches rank 2 * distance, prefix matches 2 * distance + 1
+        masks, size = _match_masks(query_key), len(query_key)
+        matched, ranks = [], []
+        for key_id in self.candidates(query_key).tolist():
+            key = self.key(key_id)
+            if len(key) < size - max_distance:
+                continue
+            if len(key) > size + max_distance:
+                # Too long to match whole; only its prefix can
+                prefix, distance = _edit_distances(masks, size, key[:size], size)[1], max_distance + 1
+            else:
+                prefix, distance = _edit_distances(masks, size, key, size)
+            if distance <= max_distance:
+                rank = 2 * distance
+            elif len(key) > size and prefix <= max_distance:
+                rank = 2 * prefix + 1
+            else:
+                continue
+            matched.append(key_id)
+            ranks.append(rank)
+        if not matched:
+            return np.empty(0, dtype=np.int64)
+
+        offsets = self._row_offsets
+        rows = np.concatenate([self._rows[offsets[k]:offsets[k + 1]] for k in matched]).astype(np.int64)
+        ranks = np.repeat(ranks, [offsets[k + 1] - offsets[k] for k in matched])
+        if within is not None:
+            keep = within[rows]
+            rows, ranks = rows[keep], ranks[keep]
+        # Sort by (rank, row) and keep each row's first, i.e. best, match
+        order = np.lexsort((rows, ranks))
+        rows = rows[order]
+        _, first = np.unique(rows, return_index=True)
+        return rows[np.sort(first)]
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self._state.values())
@@ -0,0 +1,139 @@
+"""Bitmap indexes over the grouped publisher table.
+
+Genres and Platforms are "; "-separated lists. Matching them with a substring
+scan per row is slow and wrong ("pc" is in any string containing "pc",
+"action" matches "action-adventure"). Instead every canonical term maps to a
+boolean array over publisher rows, built once per dataset. A selection is
+then a handful of vectorized OR/AND operations.
+
+Every index here can hand back its arrays (``state()``) and be rebuilt from
+them, which is how the loader saves them next to the snapshot: a new process
+maps them from disk instead of building them again.
+"""
+
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from publisher_core.fuzzy import FuzzyNameIndex
+from publisher_core.search import TrigramIndex, readonly, search_documents
+from publisher_core.store import publisher_id
+
+
+def _substate(state, part):
+    prefix = f"{part}."
+    return {name[len(prefix):]: value for name, value in state.items() if name.startswith(prefix)}
+
+
+class TermIndex:
+    """Maps each term of a list-valued column to a boolean array over rows."""
+
+    def __init__(self, values):
+        values = pd.Series(list(values), dtype=object)
+        pieces = values.str.split(";").explode().str.strip().str.lower()
+        pieces = pieces[pieces.notna() & (pieces != "")]
+        codes, terms = pd.factorize(pieces)
+        bitmaps = np.zeros((len(terms), len(values)), dtype=bool)
+        bitmaps[codes, pieces.index.to_numpy()] = True
+        self._load(list(terms), bitmaps)
+
+    @classmethod
+    def from_state(cls, state):
+        index = cls.__new__(cls)
+        index._load(state["terms"], state["bitmaps"])
+        return index
+
+    def state(self):
+        """The term list and bitmap matrix :meth:`from_state` rebuilds the index from."""
+        return {"terms": list(self._bitmaps), "bitmaps": self._matrix}
+
+    def _load(self, terms, bitmaps):
+        self.size = bitmaps.shape[1]
+        self._matrix = readonly(bitmaps)
+        self._bitmaps = dict(zip(terms, bitmaps))
+        self._empty = readonly(np.zeros(self.size, dtype=bool))
+
+    def __contains__(self, term):
+        return term.strip().lower() in self._bitmaps
+
+    def terms(self):
+        return sorted(self._bitmaps)
+
+    def bitmap(self, term):
+        return self._bitmaps.get(term.strip().lower(), self._empty)
+
+    def any_of(self, terms, rows=None):
+        """Rows carrying at least one of ``terms`` (none for an empty selection).
+
+        With ``rows`` (an array of row ids) only those rows are tested, and the
+        mask is aligned with ``rows`` rather than with the whole table.
+        """
+        mask = np.zeros(self.size if rows is None else len(rows), dtype=bool)
+        for term in terms:
+            bitmap = self.bitmap(term)
+            mask |= bitmap if rows is None else bitmap[rows]
+        return mask
+
+    def all_of(self, terms, rows=None):
+        """Rows carrying every one of ``terms`` (all rows for an empty selection)."""
+        mask = np.ones(self.size if rows is None else len(rows), dtype=bool)
+        for term in terms:
+            bitmap = self.bitmap(term)
+            mask &= bitmap if rows is None else bitmap[rows]
+        return mask
+
+    @property
+    def nbytes(self):
+        return self._matrix.nbytes
+
+
+class PublisherIndex:
+    """All precomputed filter structures for one grouped publisher table.
+
+    ``state`` is what :meth:`state` returned for this same table (the loader
+    keeps it next to the snapshot); with it nothing has to be rebuilt.
+    """
+
+    def __init__(self, grouped_df, state=None):
+        self.size = len(grouped_df)
+        self.budget_min = readonly(grouped_df["Budget Min"].to_numpy(copy=True))
+        self.has_contact = readonly((
+            (grouped_df["Contact name"].str.strip() != "") |
+            (grouped_df["email"].str.strip() != "")
+        ).to_numpy(copy=True))
+        self._publishers = grouped_df["Publisher"]
+        if state is None:
+            self.genres = TermIndex(grouped_df["Genres"])
+            self.platforms = TermIndex(grouped_df["Platforms"])
+            self.text = TrigramIndex(search_documents(grouped_df))
+            self.names = FuzzyNameIndex(grouped_df["Publisher"])
+        else:
+            self.genres = TermIndex.from_state(_substate(state, "genres"))
+            self.platforms = TermIndex.from_state(_substate(state, "platforms"))
+            self.text = TrigramIndex.from_state(_substate(state, "text"))
+            self.names = FuzzyNameIndex.from_state(_substate(state, "names"))
+
+    def state(self):
+        """Everything expensive to build, as one flat ``{"part.name": value}`` dict."""
+        parts = {"genres": self.genres, "platforms": self.platforms, "text": self.text, "names": self.names}
+        return {f"{part}.{name}": value for part, index in parts.items() for name, value in index.state().items()}
+
+    @cached_property
+    def _id_rows(self):
+        rows = {}
+        for row, name in enumerate(self._publishers):
+            rows.setdefault(publisher_id(name), []).append(row)
+        return rows
+
+    def rows_for(self, publisher_ids):
+        """Sorted row ids of the publishers with the given store ids; unknown ids are skipped."""
+        rows = [row for pid in publisher_ids for row in self._id_rows.get(pid, ())]
+        return np.array(sorted(rows), dtype=np.int64)
+
+    @property
+    def nbytes(self):
+        return (
+            self.genres.nbytes + self.platforms.nbytes + self.budget_min.nbytes
+            + self.has_contact.nbytes + self.text.nbytes + self.names.nbytes
+        )
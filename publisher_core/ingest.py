@@ -0,0 +1,113 @@
+"""Streaming ingestion of contact workbooks.
+
+``pd.read_excel`` materializes the whole sheet, then the cleaning steps make
+copies of every column before the groupby collapses it to one row per
+publisher. Here rows are pulled one at a time through openpyxl's read-only
+mode, normalized exactly as the apps do, and folded straight into one record
+per publisher, so peak memory tracks the grouped output instead of the raw
+sheet. Several workbooks (e.g. partner lists) can be merged in a single pass.
+"""
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from publisher_core.budget import add_budget_columns
+
+GROUPED_COLUMNS = ["Publisher", "URL", "Genres", "Platforms", "budget range", "Contact name", "email"]
+_SOURCE_COLUMNS = ["Publisher", "URL", "Platforms", "Genres", "Contact name", "email", "budget range"]
+# Partner lists don't always carry these; a missing column reads as blank.
+_OPTIONAL_COLUMNS = {"URL"}
+
+
+class IngestError(ValueError):
+    pass
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, str) and value == "")
+
+
+def iter_contact_rows(path, sheet_name=None):
+    """Yield ``(publisher, url, platforms, genres, contact, email, budget)`` per sheet row.
+
+    Reads the first sheet unless ``sheet_name`` is given, like ``pd.read_excel``.
+    Blank cells come back as ``None``.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        missing = [col for col in _SOURCE_COLUMNS if col not in header and col not in _OPTIONAL_COLUMNS]
+        if missing:
+            raise IngestError(f"{path}: missing column(s) {', '.join(missing)}")
+        # Absent optional columns point one past the row, which is padded with None
+        width = len(header) + 1
+        positions = [header.index(col) if col in header else len(header) for col in _SOURCE_COLUMNS]
+
+        for values in rows:
+            if len(values) < width:
+                values = tuple(values) + (None,) * (width - len(values))
+            yield tuple(None if _is_missing(values[i]) else values[i] for i in positions)
+    finally:
+        wb.close()
+
+
+class PublisherAccumulator:
+    """Folds contact rows into one record per publisher.
+
+    Mirrors ``loader.group_publishers``: Genres/Platforms come from a
+    publisher's first row, URL and "budget range" from its first non-blank one, and
+    contact names/emails are de-duplicated in order of appearance. Budgets are
+    parsed once over the grouped column in ``to_frame``.
+    """
+
+    def __init__(self):
+        self._records = {}
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, publisher, url, platforms, genres, contact, email, budget):
+        if publisher is None:
+            return
+        record = self._records.get(publisher)
+        if record is None:
+            record = self._records[publisher] = [
+                url,
+                "" if genres is None else str(genres).lower(),
+                "" if platforms is None else str(platforms).lower(),
+                budget,
+                {},
+                {},
+            ]
+        else:
+            if record[0] is None:
+                record[0] = url
+            if record[3] is None:
+                record[3] = budget
+        if contact is not None:
+            record[4][str(contact)] = None
+        if email is not None:
+            record[5][str(email)] = None
+
+    def to_frame(self):
+        rows = []
+        for publisher in sorted(self._records):
+            url, genres, platforms, budget, names, emails = self._records[publisher]
+            rows.append([
+                publisher, url, genres, platforms, budget,
+                "; ".join(filter(None, names)), "; ".join(filter(None, emails)),
+            ])
+        return add_budget_columns(pd.DataFrame(rows, columns=GROUPED_COLUMNS))
+
+
+def stream_publishers(paths, sheet_name=None):
+    """Group one or more contact workbooks into a single publisher table."""
+    if isinstance(paths, (str, bytes)) or hasattr(paths, "__fspath__"):
+        paths = [paths]
+    acc = PublisherAccumulator()
+    for path in paths:
+        for row in iter_contact_rows(path, sheet_name):
+            acc.add(*row)
+    return acc.to_frame()
@@ -0,0 +1,169 @@
+"""Process-wide, change-aware loader for the master publisher workbook.
+
+Every Streamlit rerun used to call ``pd.read_excel`` and redo the cleaning and
+grouping. ``load_publishers`` parses the workbook once per process and only
+parses it again when the file on disk actually changes.
+"""
+
+import hashlib
+import os
+import threading
+from collections import namedtuple
+
+from publisher_core.budget import add_budget_columns
+from publisher_core.index import PublisherIndex
+
+WORKBOOK_PATH = "Master publishers contact list .xlsx"
+PLATFORM_LIST = ("PC", "Console", "Mobile", "VR")
+
+# ─── Cleaning & Grouping ─────────────────────────────────────────────────────────
+
+
+def normalize_contacts(df):
+    """Lower-case Platforms/Genres and blank out missing contact fields."""
+    df["Platforms"] = df["Platforms"].fillna("").str.lower()
+    df["Genres"] = df["Genres"].fillna("").str.lower()
+    df["Contact name"] = df["Contact name"].fillna("").astype(str)
+    df["email"] = df["email"].fillna("").astype(str)
+    return df
+
+
+def group_publishers(df):
+    """Merge the one-row-per-contact sheet into one row per publisher."""
+    grouped_df = df.groupby("Publisher", as_index=False).agg({
+        "URL": "first",
+        "Genres": "first",
+        "Platforms": "first",
+        "budget range": "first",
+        "Contact name": lambda x: "; ".join(filter(None, x.unique())),
+        "email": lambda x: "; ".join(filter(None, x.unique()))
+    })
+    return add_budget_columns(grouped_df)
+
+
+def build_genres_list(grouped_df):
+    all_genres = set()
+    for g in grouped_df["Genres"].dropna():
+        for piece in g.split(";"):
+            all_genres.add(piece.strip())
+    return sorted(all_genres)
+
+
+# ─── Dataset ─────────────────────────────────────────────────────────────────────
+
+
+class PublisherDataset:
+    """The grouped publisher table plus everything derived from it.
+
+    ``version`` is the content hash of the workbook it was built from, so it
+    changes exactly when the data does. ``index`` holds the filter bitmaps,
+    built once here rather than on every rerun, or restored from
+    ``index_state`` when the snapshot has them saved.
+
+    One instance per workbook is shared by every session in the process and
+    must be treated as immutable; sessions select from it by row id.
+    """
+
+    def __init__(self, grouped_df, version, genres_list=None, index_state=None):
+        self._grouped_df = grouped_df
+        self.version = version
+        self.genres_list = tuple(build_genres_list(grouped_df) if genres_list is None else genres_list)
+        self.index = PublisherIndex(grouped_df, index_state)
+
+    def __len__(self):
+        return len(self._grouped_df)
+
+    @property
+    def grouped_df(self):
+        """A shallow handle on the shared table.
+
+        No data is copied, but each caller gets its own frame object, so adding
+        or replacing columns (and, under pandas copy-on-write, editing values)
+        never leaks into the table other sessions are reading.
+        """
+        return self._grouped_df.copy(deep=False)
+
+
+def publishers_from_frame(df):
+    """Clean and group a contacts DataFrame that is already in memory."""
+    return group_publishers(normalize_contacts(df))
+
+
+def read_workbook(path):
+    """Stream the workbook row by row into the grouped publisher table."""
+    from publisher_core.ingest import stream_publishers
+
+    return stream_publishers(path)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_dataset(path, digest):
+    """Open the columnar snapshot if it matches ``digest``, else parse the workbook.
+
+    The indexes are mapped from the snapshot too when saved for ``digest``;
+    whatever had to be built is saved for the next process.
+    """
+    from publisher_core import snapshot
+
+    cached = snapshot.read_snapshot(path, digest)
+    if cached is not None:
+        grouped_df, genres_list = cached
+        index_state = snapshot.read_index(path, digest)
+        dataset = PublisherDataset(grouped_df, digest, genres_list, index_state)
+        if index_state is None:
+            snapshot.write_index(path, digest, dataset.index.state())
+        return dataset
+
+    dataset = PublisherDataset(read_workbook(path), digest)
+    snapshot.write_snapshot(path, digest, dataset.grouped_df, dataset.genres_list)
+    snapshot.write_index(path, digest, dataset.index.state())
+    return dataset
+
+
+# ─── Process-wide Cache ──────────────────────────────────────────────────────────
+
+_CacheEntry = namedtuple("_CacheEntry", ["mtime_ns", "size", "digest", "dataset"])
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_publishers(path=WORKBOOK_PATH):
+    """Return the dataset for ``path``, parsing the workbook only when needed.
+
+    A matching mtime and size is trusted as-is. When either changes the file is
+    hashed, and the workbook is only parsed again if the content differs (a
+    plain ``touch`` or a re-save with no edits keeps the cached dataset). A new
+    process starts from the columnar snapshot when one matches the workbook.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    with _cache_lock:
+        entry = _cache.get(path)
+        if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return entry.dataset
+
+        digest = file_digest(path)
+        if entry and entry.digest == digest:
+            dataset = entry.dataset
+        else:
+            dataset = build_dataset(path, digest)
+        _cache[path] = _CacheEntry(stat.st_mtime_ns, stat.st_size, digest, dataset)
+        return dataset
+
+
+def loaded_datasets():
+    with _cache_lock:
+        return [entry.dataset for entry in _cache.values()]
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
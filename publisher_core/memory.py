@@ -0,0 +1,81 @@
+"""Per-process memory report.
+
+Every session shares the one dataset the loader keeps per workbook, so memory
+should grow with the dataset and the result cache, not with the number of
+people logged in. The report puts those numbers side by side with the
+process RSS, to size the box before more of the sales team joins.
+"""
+
+import os
+import resource
+import sys
+import threading
+
+from publisher_core import loader
+from publisher_core.cache import RESULT_CACHE
+from publisher_core.export import EXPORT_CACHE
+
+
+def process_rss():
+    """Current resident set size in bytes (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+_sessions = set()
+_sessions_lock = threading.Lock()
+
+
+def note_session(session_id):
+    """Remember a Streamlit session that ran the app, for ``active_sessions``."""
+    with _sessions_lock:
+        _sessions.add(session_id)
+
+
+def active_sessions():
+    """Number of connected sessions that have run the app, or None outside a Streamlit server.
+
+    Sessions are recorded by ``note_session`` as they rerun and checked
+    against the runtime's public ``is_active_session``; those that have
+    disconnected are forgotten.
+    """
+    try:
+        from streamlit.runtime import Runtime
+    except ImportError:
+        return None
+    if not Runtime.exists():
+        return None
+    runtime = Runtime.instance()
+    with _sessions_lock:
+        _sessions.intersection_update([sid for sid in _sessions if runtime.is_active_session(sid)])
+        return len(_sessions)
+
+
+def dataset_bytes(dataset):
+    return int(dataset.grouped_df.memory_usage(deep=True).sum())
+
+
+def memory_report():
+    """Dict of the process-wide memory figures, in bytes."""
+    datasets = loader.loaded_datasets()
+    return {
+        "rss_bytes": process_rss(),
+        "active_sessions": active_sessions(),
+        "datasets": len(datasets),
+        "dataset_bytes": sum(dataset_bytes(d) for d in datasets),
+        "index_bytes": sum(d.index.nbytes for d in datasets),
+        "result_cache": RESULT_CACHE.stats(),
+        "export_cache": EXPORT_CACHE.stats(),
+    }
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
@@ -0,0 +1,252 @@
+"""Prometheus metrics for capacity planning, in the text exposition format.
+
+The apps' own instrumentation feeds these. ``views.finish`` turns each
+rerun's timer into latency histograms per app, per pipeline stage and per
+view, plus the number of rows the filters returned. Reruns are split by
+kind: ``full`` runs the whole script, ``fragment`` only the results region. Every export build adds
+its bytes and duration. The process RSS, the active session count and the
+result and export cache statistics are read when the metrics are scraped.
+
+Metrics are per process, so they are served from the Streamlit process
+itself. Set ``LODESTAR_METRICS_PORT`` and the first rerun starts a small
+HTTP server on a daemon thread (localhost unless ``LODESTAR_METRICS_HOST``
+says otherwise)::
+
+    LODESTAR_METRICS_PORT=9464 streamlit run full_app.py
+    curl localhost:9464/metrics
+
+The HTTP API serves the same text at ``/metrics`` for its own process.
+Only the standard library is used.
+"""
+
+import logging
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PORT_ENV = "LODESTAR_METRICS_PORT"
+HOST_ENV = "LODESTAR_METRICS_HOST"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._children = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} takes labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = sorted(self._children.items())
+        for key, value in children:
+            lines.extend(self._samples(key, value))
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    def _samples(self, key, value):
+        return [f"{self.name}{_labels(self.label_names, key)} {_number(value)}"]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        # Non-cumulative counts per bucket, plus one slot for +Inf
+        slot = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            child[0][slot] += 1
+            child[1] += value
+
+    def _samples(self, key, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, key, [('le', _number(bound))])} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+        lines.append(f"{self.name}_count{_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+# ─── Metrics ────────────────────────────────────────────────────────────────────
+
+RERUN_SECONDS = Histogram("lodestar_rerun_seconds", "Script rerun latency.", ["app", "kind"])
+STAGE_SECONDS = Histogram("lodestar_stage_seconds", "Pipeline stage latency per rerun.", ["stage"])
+VIEW_SECONDS = Histogram("lodestar_view_seconds", "View render latency per rerun.", ["view"])
+ROWS_FILTERED = Histogram("lodestar_rows_filtered", "Publishers matching the filters, per rerun.", ["app"],
+                          buckets=ROW_BUCKETS)
+EXPORT_SECONDS = Histogram("lodestar_export_seconds", "Time to build an export file.", ["format"])
+EXPORT_BYTES = Counter("lodestar_export_bytes_total", "Bytes of export files built.", ["format"])
+
+_METRICS = [RERUN_SECONDS, STAGE_SECONDS, VIEW_SECONDS, ROWS_FILTERED, EXPORT_SECONDS, EXPORT_BYTES]
+
+
+def observe_rerun(app, timer, rows, fragment=False):
+    """Record one rerun from its ``RerunTimer``; stages named ``render.*`` are views.
+
+    A ``fragment`` rerun didn't filter, so it adds no rows sample.
+    """
+    RERUN_SECONDS.observe(timer.total(), app=app, kind="fragment" if fragment else "full")
+    if not fragment:
+        ROWS_FILTERED.observe(rows, app=app)
+    for name, ms in timer.breakdown().items():
+        if name.startswith("render."):
+            VIEW_SECONDS.observe(ms / 1000, view=name[len("render."):])
+        else:
+            STAGE_SECONDS.observe(ms / 1000, stage=name)
+
+
+def observe_export(fmt, seconds, size):
+    EXPORT_SECONDS.observe(seconds, format=fmt)
+    EXPORT_BYTES.inc(size, format=fmt)
+
+
+def _process_metrics():
+    # Imported here: memory imports export, which reports into this module
+    from publisher_core.memory import memory_report
+
+    report = memory_report()
+    gauges = [
+        Gauge("lodestar_process_resident_memory_bytes", "Resident set size of this process."),
+        Gauge("lodestar_active_sessions", "Connected Streamlit sessions."),
+        Gauge("lodestar_dataset_bytes", "Memory held by the shared publisher datasets."),
+    ]
+    gauges[0].set(report["rss_bytes"])
+    if report["active_sessions"] is not None:
+        gauges[1].set(report["active_sessions"])
+    gauges[2].set(report["dataset_bytes"] + report["index_bytes"])
+
+    caches = [
+        Counter("lodestar_cache_hits_total", "Cache lookups served from the cache.", ["cache"]),
+        Counter("lodestar_cache_misses_total", "Cache lookups that had to compute.", ["cache"]),
+        Counter("lodestar_cache_evictions_total", "Entries evicted to stay under the size cap.", ["cache"]),
+        Gauge("lodestar_cache_entries", "Entries held.", ["cache"]),
+        Gauge("lodestar_cache_bytes", "Bytes held.", ["cache"]),
+        Gauge("lodestar_cache_hit_ratio", "Hits over lookups since start.", ["cache"]),
+    ]
+    for cache, stats in (("result", report["result_cache"]), ("export", report["export_cache"])):
+        caches[0].inc(stats["hits"], cache=cache)
+        caches[1].inc(stats["misses"], cache=cache)
+        caches[2].inc(stats["evictions"], cache=cache)
+        caches[3].set(stats["entries"], cache=cache)
+        caches[4].set(stats["bytes"], cache=cache)
+        caches[5].set(stats["hit_ratio"], cache=cache)
+    return gauges + caches
+
+
+def render_metrics():
+    """Every metric in the Prometheus text format."""
+    lines = []
+    for metric in _METRICS + _process_metrics():
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ─── HTTP Endpoint ──────────────────────────────────────────────────────────────
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    """Serve ``/metrics`` on a daemon thread of this process; returns the server."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+_server = None
+_server_started = False
+_server_lock = threading.Lock()
+
+
+def start_from_env():
+    """Start the endpoint once per process if ``LODESTAR_METRICS_PORT`` is set.
+
+    Tried once; if the port is taken (say, by a second app on the same box)
+    the app runs on without it.
+    """
+    global _server, _server_started
+    if _server_started or not os.environ.get(PORT_ENV):
+        return _server
+    with _server_lock:
+        if not _server_started:
+            _server_started = True
+            try:
+                _server = serve_metrics(int(os.environ[PORT_ENV]), os.environ.get(HOST_ENV, "127.0.0.1"))
+            except (OSError, ValueError) as exc:
+                logging.getLogger("lodestar.metrics").warning("metrics endpoint not started: %s", exc)
+    return _server
@@ -0,0 +1,148 @@
+"""Trigram index for the keyword search box.
+
+The keyword filter used a row-wise ``DataFrame.apply`` on every keystroke. The
+index maps each three-byte sequence of the rows' UTF-8 searchable text to the
+sorted ids of the rows that contain it. A query intersects the postings of its
+own trigrams (rarest first), and only those candidates are checked with a real
+substring test, so the cost follows the number of matches rather than the
+size of the table.
+
+Everything lives in a few flat arrays (the text, the sorted trigram codes and
+their postings), built with vectorized numpy rather than per-row Python, and
+saved next to the columnar snapshot so a new process only has to map them.
+"""
+
+import numpy as np
+
+SEARCH_FIELDS = ["Publisher", "Genres", "Platforms", "Contact name", "email", "URL"]
+_EMPTY = np.empty(0, dtype=np.int64)
+# Rows are joined by NUL and fields by newline; no trigram spans either
+_ROW_SEP = 0
+_FIELD_SEP = 10
+
+
+def trigram_codes(data):
+    """Codes ``b0 << 16 | b1 << 8 | b2`` of the byte trigrams in a uint8 array.
+
+    Returns the codes and a mask of the ones that contain no separator.
+    """
+    data = np.asarray(data, dtype=np.uint8)
+    if len(data) < 3:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=bool)
+    wide = data.astype(np.int32)
+    codes = (wide[:-2] << 16) | (wide[1:-1] << 8) | wide[2:]
+    sep = (data == _ROW_SEP) | (data == _FIELD_SEP)
+    return codes, ~(sep[:-2] | sep[1:-1] | sep[2:])
+
+
+def inverted_index(codes, ids):
+    """Sorted distinct codes, CSR offsets, and the sorted distinct ids of each code."""
+    pairs = (codes.astype(np.int64) << 32) | ids
+    pairs.sort()
+    if len(pairs):
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+    grams = pairs >> 32
+    starts = np.flatnonzero(np.concatenate(([True], grams[1:] != grams[:-1]))) if len(grams) else _EMPTY
+    offsets = np.append(starts, len(pairs)).astype(np.int64)
+    return grams[starts], offsets, (pairs & 0xFFFFFFFF).astype(np.int32)
+
+
+def search_documents(grouped_df, fields=SEARCH_FIELDS):
+    """One lower-case string per row, fields separated so no trigram spans two."""
+    columns = [grouped_df[field].fillna("").astype(str).str.lower() for field in fields]
+    return columns[0].str.cat(columns[1:], sep="\n").tolist()
+
+
+def readonly(array):
+    """Freeze ``array`` in place; the indexes are shared by every session."""
+    array.setflags(write=False)
+    return array
+
+
+class TrigramIndex:
+    def __init__(self, documents):
+        encoded = [doc.encode("utf-8") for doc in documents]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        text = np.frombuffer(b"\0".join(encoded) + b"\0", dtype=np.uint8)
+        starts = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(lengths + 1, out=starts[1:])
+
+        codes, valid = trigram_codes(text)
+        rows = np.repeat(np.arange(len(encoded), dtype=np.int64), lengths + 1)[:len(codes)]
+        grams, offsets, postings = inverted_index(codes[valid], rows[valid])
+        self._load(text, starts, grams, offsets, postings)
+
+    @classmethod
+    def from_state(cls, state):
+        index = cls.__new__(cls)
+        index._load(state["text"], state["starts"], state["grams"], state["offsets"], state["postings"])
+        return index
+
+    def state(self):
+        """The arrays :meth:`from_state` rebuilds the index from."""
+        return {
+            "text": self._text_array, "starts": self._starts, "grams": self._grams,
+            "offsets": self._offsets, "postings": self._postings,
+        }
+
+    def _load(self, text, starts, grams, offsets, postings):
+        self._text_array = readonly(text)
+        self._text = text.tobytes()
+        self._starts = readonly(starts)
+        self._start_list = starts.tolist()
+        self._grams = readonly(grams)
+        self._offsets = readonly(offsets)
+        self._postings = readonly(postings)
+
+    def __len__(self):
+        return len(self._starts) - 1
+
+    def candidates(self, query):
+        """Row ids that contain every trigram of ``query``.
+
+        Returns None when the query is too short to have trigrams, in which
+        case the caller has to scan.
+        """
+        codes, valid = trigram_codes(np.frombuffer(query.encode("utf-8"), dtype=np.uint8))
+        if not valid.any():
+            return None
+        codes = np.unique(codes[valid])
+        found = np.searchsorted(self._grams, codes)
+        if found[-1] >= len(self._grams) or (self._grams[found] != codes).any():
+            return _EMPTY
+        lists = [self._postings[self._offsets[i]:self._offsets[i + 1]] for i in found]
+        lists.sort(key=len)
+        result = lists[0]
+        for rows in lists[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, rows, assume_unique=True)
+        return result.astype(np.int64)
+
+    def search(self, query, within=None, rows=None):
+        """Sorted ids of rows whose text contains ``query`` (case-insensitive).
+
+        ``within`` is an optional boolean mask limiting the rows considered;
+        ``rows`` an optional sorted array of row ids doing the same, for when a
+        previous result already narrowed things down.
+        """
+        query = query.strip().lower()
+        candidates = self.candidates(query)
+        if rows is None:
+            rows = np.arange(len(self), dtype=np.int64) if candidates is None else candidates
+        elif candidates is not None and len(candidates) < len(rows):
+            rows = np.intersect1d(rows, candidates, assume_unique=True)
+        if within is not None:
+            rows = rows[within[rows]]
+        if not query:
+            return rows
+
+        needle, text, starts = query.encode("utf-8"), self._text, self._start_list
+        return np.array(
+            [row for row in rows.tolist() if text.find(needle, starts[row], starts[row + 1] - 1) >= 0],
+            dtype=np.int64,
+        )
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.state().values())
@@ -0,0 +1,166 @@
+"""Columnar snapshot of the grouped publisher table.
+
+Parsing the workbook through openpyxl is by far the slowest way to get the data
+into pandas. The snapshot is an uncompressed Arrow IPC (Feather v2) file that
+holds the normalized, grouped table, so later processes can memory-map it
+instead of re-reading the .xlsx.
+
+Compile it ahead of a deploy with::
+
+    python -m publisher_core.snapshot ["Master publishers contact list .xlsx"]
+
+The apps also write it on their first load, and rebuild it whenever the
+workbook no longer matches the digest recorded in the snapshot. pyarrow is
+optional: without it every load simply reads the workbook.
+
+The filter indexes built from the table go in a second file next to it
+(``<name>.index.arrow``), tagged with the same digest: each array is stored as
+raw bytes and mapped back without a copy, so a new process skips the builds.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:  # pragma: no cover - snapshots are an optimization only
+    pa = None
+
+# Bump whenever the grouped table's columns or their meaning change, so stale
+# snapshots are rebuilt instead of loaded.
+SNAPSHOT_FORMAT = 3
+# Bump whenever the layout of the saved index arrays changes.
+INDEX_FORMAT = 1
+SNAPSHOT_DIR = ".snapshots"
+_META_KEY = b"lodestar"
+
+
+def available():
+    return pa is not None
+
+
+def snapshot_path(workbook_path):
+    folder = os.path.join(os.path.dirname(os.path.abspath(workbook_path)), SNAPSHOT_DIR)
+    name = os.path.splitext(os.path.basename(workbook_path))[0].strip()
+    return os.path.join(folder, f"{name}.arrow")
+
+
+def index_path(workbook_path):
+    return f"{os.path.splitext(snapshot_path(workbook_path))[0]}.index.arrow"
+
+
+def _read_table(path):
+    """The table and its decoded metadata, or None when missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path) as source:
+            table = ipc.open_file(source).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    return table, json.loads((table.schema.metadata or {}).get(_META_KEY, b"{}"))
+
+
+def _write_table(path, table):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    return path
+
+
+def read_snapshot(workbook_path, digest):
+    """Return ``(grouped_df, genres_list)`` from a current snapshot, else None."""
+    if pa is None:
+        return None
+    loaded = _read_table(snapshot_path(workbook_path))
+    if loaded is None:
+        return None
+    table, meta = loaded
+    if meta.get("format") != SNAPSHOT_FORMAT or meta.get("digest") != digest:
+        return None
+    grouped_df = table.replace_schema_metadata(None).to_pandas()
+    return grouped_df, meta["genres"]
+
+
+def write_snapshot(workbook_path, digest, grouped_df, genres_list):
+    """Write the snapshot atomically; a failed write only costs the speed-up."""
+    if pa is None:
+        return None
+    meta = {"format": SNAPSHOT_FORMAT, "digest": digest, "genres": list(genres_list)}
+    table = pa.Table.from_pandas(grouped_df, preserve_index=False)
+    table = table.replace_schema_metadata({_META_KEY: json.dumps(meta).encode("utf-8")})
+    return _write_table(snapshot_path(workbook_path), table)
+
+
+def read_index(workbook_path, digest):
+    """Return the index state saved for ``digest``, else None.
+
+    The arrays come back read-only, backed by the memory-mapped file.
+    """
+    if pa is None:
+        return None
+    loaded = _read_table(index_path(workbook_path))
+    if loaded is None:
+        return None
+    table, meta = loaded
+    if (meta.get("format"), meta.get("snapshot"), meta.get("digest")) != (INDEX_FORMAT, SNAPSHOT_FORMAT, digest):
+        return None
+    state = dict(meta["values"])
+    for name, (dtype, shape) in meta["arrays"].items():
+        raw = table.column(name).chunk(0).values.to_numpy(zero_copy_only=True)
+        state[name] = raw.view(dtype).reshape(shape)
+    return state
+
+
+def write_index(workbook_path, digest, state):
+    """Save an index state (numpy arrays plus JSON-able values) atomically."""
+    if pa is None:
+        return None
+    arrays = {name: value for name, value in state.items() if isinstance(value, np.ndarray)}
+    meta = {
+        "format": INDEX_FORMAT, "snapshot": SNAPSHOT_FORMAT, "digest": digest,
+        "arrays": {name: [array.dtype.str, list(array.shape)] for name, array in arrays.items()},
+        "values": {name: value for name, value in state.items() if name not in arrays},
+    }
+    columns = {}
+    for name, array in arrays.items():
+        raw = pa.array(np.ascontiguousarray(array).reshape(-1).view(np.uint8))
+        columns[name] = pa.LargeListArray.from_arrays(pa.array([0, len(raw)], pa.int64()), raw)
+    table = pa.table(columns).replace_schema_metadata({_META_KEY: json.dumps(meta).encode("utf-8")})
+    return _write_table(index_path(workbook_path), table)
+
+
+def main(argv=None):
+    from publisher_core.index import PublisherIndex
+    from publisher_core.loader import WORKBOOK_PATH, file_digest, read_workbook, build_genres_list
+
+    argv = sys.argv[1:] if argv is None else argv
+    workbook_path = argv[0] if argv else WORKBOOK_PATH
+    if pa is None:
+        print("pyarrow is not installed; cannot compile a snapshot.", file=sys.stderr)
+        return 1
+
+    digest = file_digest(workbook_path)
+    grouped_df = read_workbook(workbook_path)
+    path = write_snapshot(workbook_path, digest, grouped_df, build_genres_list(grouped_df))
+    if path is None or write_index(workbook_path, digest, PublisherIndex(grouped_df).state()) is None:
+        print(f"Could not write snapshot for {workbook_path}", file=sys.stderr)
+        return 1
+    print(f"Wrote {len(grouped_df)} publishers and their indexes to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
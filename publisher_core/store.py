@@ -0,0 +1,321 @@
+"""Durable tags and follow-up dates, shared by everyone using the apps.
+
+Tags used to live in ``st.session_state`` and the contact dates nowhere, so a
+refresh lost them and nobody saw anyone else's. They are kept in a local
+SQLite database in WAL mode instead, keyed by a stable publisher id. Readers
+never wait for the writer, a session only reads the publishers it shows, and
+the changes a session stages between reruns are written in one transaction.
+With ``synchronous=NORMAL`` a commit appends to the WAL without an fsync, so
+saving doesn't add latency to the click; a crash can lose at most the last
+few commits, never corrupt the file. Each process also keeps two in-memory
+indexes, a reverse index from tag to publisher ids and the next-contact dates
+in sorted order. Both are updated by the process's own writes and reloaded
+when ``PRAGMA data_version`` shows another process committed.
+
+    store = open_store()
+    writes = store.batch()
+    writes.set_tag("Devolver Digital", "Contacted", True)
+    writes.set_followup("Devolver Digital", next_contact=datetime.date(2026, 11, 2))
+    writes.commit()
+    store.tags(["Devolver Digital"])  # {"Devolver Digital": ["Contacted"]}
+    store.due_between(end=datetime.date.today())  # overdue or due today
+"""
+
+import datetime
+import os
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from contextlib import contextmanager
+
+from publisher_core.tags import TAG_OPTIONS
+
+STORE_PATH = "lodestar_crm.sqlite3"
+FOLLOWUP_FIELDS = ("last_contacted", "next_contact")
+# Stay under SQLITE_MAX_VARIABLE_NUMBER on older builds
+_MAX_PARAMS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tags (
+    publisher_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (publisher_id, tag)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS followups (
+    publisher_id TEXT PRIMARY KEY,
+    last_contacted TEXT,
+    next_contact TEXT
+) WITHOUT ROWID;
+"""
+
+Followup = namedtuple("Followup", FOLLOWUP_FIELDS)
+NO_FOLLOWUP = Followup(None, None)
+
+
+def publisher_id(name):
+    """Stable key for a publisher: its name with case and spacing normalized."""
+    return " ".join(str(name).split()).casefold()
+
+
+def _tag_order(tag):
+    return (TAG_OPTIONS.index(tag), "") if tag in TAG_OPTIONS else (len(TAG_OPTIONS), tag)
+
+
+def _to_date(value):
+    return datetime.date.fromisoformat(value) if value else None
+
+
+def _chunks(items, size=_MAX_PARAMS):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class DueIndex:
+    """Next-contact dates in sorted order, for range queries by bisection.
+
+    A query costs O(log N) plus the number of publishers it returns, so the
+    "who's due" lists don't depend on how many publishers are tracked.
+    """
+
+    def __init__(self, pairs=()):
+        entries = sorted((day.toordinal(), pid) for pid, day in pairs)
+        self._days = [day for day, _ in entries]
+        self._ids = [pid for _, pid in entries]
+        self._by_id = dict(zip(self._ids, self._days))
+
+    def __len__(self):
+        return len(self._days)
+
+    def set(self, pid, day):
+        """Move ``pid`` to ``day``, or drop it when ``day`` is None."""
+        old = self._by_id.pop(pid, None)
+        if old is not None:
+            position = self._ids.index(pid, bisect_left(self._days, old), bisect_right(self._days, old))
+            del self._days[position]
+            del self._ids[position]
+        if day is not None:
+            ordinal = day.toordinal()
+            position = bisect_right(self._days, ordinal)
+            self._days.insert(position, ordinal)
+            self._ids.insert(position, pid)
+            self._by_id[pid] = ordinal
+
+    def between(self, start=None, end=None):
+        """``[(publisher_id, date)]`` due from ``start`` to ``end`` inclusive, soonest first.
+
+        Either bound may be None for an open range.
+        """
+        lo = 0 if start is None else bisect_left(self._days, start.toordinal())
+        hi = len(self._days) if end is None else bisect_right(self._days, end.toordinal())
+        return [(self._ids[i], datetime.date.fromordinal(self._days[i])) for i in range(lo, hi)]
+
+
+class CrmStore:
+    def __init__(self, path=STORE_PATH, timeout=5.0):
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        # Every write from this process goes through one connection, whose
+        # PRAGMA data_version then only moves when another process commits
+        self._writer = self._connect()
+        self._write_lock = threading.Lock()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.executescript(_SCHEMA)
+        self._tag_index = None
+        self._due_index = None
+        self._index_version = None
+
+    def _connect(self):
+        # Streamlit reruns on a fresh thread each time, so read connections are
+        # pooled rather than per-thread; each one is used by one thread at a time
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                self._idle.append(conn)
+
+    def _select(self, sql, publishers):
+        """Run ``sql`` (with one ``{}`` for the id list) for ``publishers``; yields (names, row)."""
+        names = {}
+        for name in publishers:
+            names.setdefault(publisher_id(name), []).append(name)
+        ids = list(names)
+        with self._connection() as conn:
+            for chunk in _chunks(ids):
+                query = sql.format(", ".join("?" * len(chunk)))
+                for row in conn.execute(query, chunk):
+                    yield names[row[0]], row[1:]
+
+    def tags(self, publishers):
+        """``{publisher: [tags]}`` for those of ``publishers`` that have any."""
+        result = {}
+        for names, (tag,) in self._select("SELECT publisher_id, tag FROM tags WHERE publisher_id IN ({})", publishers):
+            for name in names:
+                result.setdefault(name, []).append(tag)
+        for tags in result.values():
+            tags.sort(key=_tag_order)
+        return result
+
+    def followups(self, publishers):
+        """``{publisher: Followup}`` for those of ``publishers`` with a saved date."""
+        sql = "SELECT publisher_id, last_contacted, next_contact FROM followups WHERE publisher_id IN ({})"
+        result = {}
+        for names, values in self._select(sql, publishers):
+            followup = Followup(*(_to_date(v) for v in values))
+            for name in names:
+                result[name] = followup
+        return result
+
+    def _data_version(self):
+        return self._writer.execute("PRAGMA data_version").fetchone()[0]
+
+    def _refresh_indexes(self):
+        """Load the in-memory indexes if missing or if another process changed the store.
+
+        Call with ``_write_lock`` held.
+        """
+        version = self._data_version()
+        if self._tag_index is not None and version == self._index_version:
+            return
+        tag_index = {}
+        for pid, tag in self._writer.execute("SELECT publisher_id, tag FROM tags"):
+            tag_index.setdefault(tag, set()).add(pid)
+        rows = self._writer.execute("SELECT publisher_id, next_contact FROM followups WHERE next_contact IS NOT NULL")
+        self._due_index = DueIndex((pid, _to_date(day)) for pid, day in rows)
+        self._tag_index, self._index_version = tag_index, version
+
+    def publishers_with(self, tags):
+        """Ids of the publishers carrying every one of ``tags`` (none if ``tags`` is empty).
+
+        Served from an in-memory tag -> publisher ids index, so the cost
+        follows the size of the smallest tag, not the number of publishers.
+        """
+        tags = set(tags)
+        if not tags:
+            return frozenset()
+        with self._write_lock:
+            self._refresh_indexes()
+            postings = sorted((self._tag_index.get(tag, ()) for tag in tags), key=len)
+            result = set(postings[0])
+            for ids in postings[1:]:
+                result.intersection_update(ids)
+        return frozenset(result)
+
+    def due_between(self, start=None, end=None):
+        """``[(publisher_id, next_contact)]`` due from ``start`` to ``end`` inclusive, soonest first."""
+        with self._write_lock:
+            self._refresh_indexes()
+            return self._due_index.between(start, end)
+
+    def batch(self):
+        return WriteBatch(self)
+
+    def write(self, tags, followups):
+        """Apply staged changes in one transaction.
+
+        ``tags`` maps ``(publisher_id, tag)`` to whether the tag is set;
+        ``followups`` maps a publisher id to ``{field: date or None}``.
+        """
+        set_tags = [key for key, on in tags.items() if on]
+        cleared_tags = [key for key, on in tags.items() if not on]
+        conn = self._writer
+        with self._write_lock:
+            # IMMEDIATE takes the write lock up front, so a busy database waits
+            # for ``timeout`` here instead of failing half way through
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("INSERT OR IGNORE INTO tags (publisher_id, tag) VALUES (?, ?)", set_tags)
+                conn.executemany("DELETE FROM tags WHERE publisher_id = ? AND tag = ?", cleared_tags)
+                for pid, fields in followups.items():
+                    columns = list(fields)
+                    conn.execute(
+                        f"INSERT INTO followups (publisher_id, {', '.join(columns)}) "
+                        f"VALUES (?{', ?' * len(columns)}) ON CONFLICT (publisher_id) DO UPDATE SET "
+                        + ", ".join(f"{c} = excluded.{c}" for c in columns),
+                        [pid] + [v.isoformat() if v else None for v in fields.values()],
+                    )
+                conn.executemany(
+                    "DELETE FROM followups WHERE publisher_id = ? AND last_contacted IS NULL AND next_contact IS NULL",
+                    [(pid,) for pid in followups],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+            if self._tag_index is None:
+                return
+            if self._data_version() != self._index_version:
+                # Another process wrote too; reload on the next lookup
+                self._tag_index = self._due_index = None
+                return
+            for pid, tag in set_tags:
+                self._tag_index.setdefault(tag, set()).add(pid)
+            for pid, tag in cleared_tags:
+                self._tag_index.get(tag, set()).discard(pid)
+            for pid, fields in followups.items():
+                if "next_contact" in fields:
+                    self._due_index.set(pid, fields["next_contact"])
+
+
+class WriteBatch:
+    """Changes staged by one session, written together by ``commit``.
+
+    Later changes to the same tag or date replace earlier ones, so a burst of
+    clicks between two reruns costs a single transaction.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._tags = {}
+        self._followups = {}
+
+    def __len__(self):
+        return len(self._tags) + len(self._followups)
+
+    def set_tag(self, publisher, tag, on):
+        self._tags[(publisher_id(publisher), tag)] = bool(on)
+
+    def set_followup(self, publisher, **dates):
+        unknown = set(dates) - set(FOLLOWUP_FIELDS)
+        if unknown:
+            raise TypeError(f"unknown follow-up field(s): {', '.join(sorted(unknown))}")
+        self._followups.setdefault(publisher_id(publisher), {}).update(dates)
+
+    def commit(self):
+        """Write everything staged; returns the number of changes written.
+
+        If the write fails the changes stay staged for the next attempt.
+        """
+        count = len(self)
+        if count:
+            self.store.write(self._tags, self._followups)
+            self._tags = {}
+            self._followups = {}
+        return count
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(path=STORE_PATH):
+    """The process-wide store for ``path``, created on first use."""
+    path = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = CrmStore(path)
+        return store
@@ -0,0 +1,40 @@
+"""Publisher tags and the bulk tag table.
+
+Tags are edited in one table for every publisher on screen, one checkbox
+column per tag, instead of a multiselect per card. The table is built from
+the tag store, and the cells changed in it are staged as one batch.
+"""
+
+import pandas as pd
+
+TAG_OPTIONS = ("Top priority", "Contacted", "Waiting reply", "Not interested", "Good fit")
+
+
+def tag_table(publishers, tags_dict, tag_options=TAG_OPTIONS):
+    """DataFrame with a Publisher column and one boolean column per tag."""
+    publishers = list(publishers)
+    table = {"Publisher": publishers}
+    for tag in tag_options:
+        table[tag] = [tag in tags_dict.get(publisher, ()) for publisher in publishers]
+    # Explicit dtypes: with no publishers every column would come out float64,
+    # which the editor's checkbox columns refuse
+    return pd.DataFrame(table).astype({"Publisher": str, **{tag: bool for tag in tag_options}})
+
+
+def tag_edits(publishers, edited_rows, seen=None):
+    """``(publisher, tag, on)`` for each cell a ``tag_table`` editor changed.
+
+    ``edited_rows`` is the data editor's ``{row position: {column: value}}``.
+    Only the touched cells come back, so two people editing different tags
+    of the same publisher don't overwrite each other. The editor keeps every
+    edit since it was created, so pass the ``edited_rows`` already handled as
+    ``seen``: only cells set since then come back, and an earlier edit is
+    not written again over what another session has saved in between.
+    """
+    seen = seen or {}
+    for position, columns in edited_rows.items():
+        before = seen.get(position, {})
+        publisher = publishers[int(position)]
+        for tag, on in columns.items():
+            if tag not in before or bool(before[tag]) != bool(on):
+                yield publisher, tag, bool(on)
@@ -0,0 +1,114 @@
+"""Per-rerun stage timings and one-shot profiles.
+
+When the app feels slow, the question is which stage is responsible: the
+load, the filters, the store, rendering a view, or an export. A
+``RerunTimer`` records how long each named stage of one script rerun took.
+The apps show that breakdown in a debug sidebar panel, and each rerun is
+also logged as one JSON line on the ``lodestar.timing`` logger (to
+``$LODESTAR_TIMING_LOG`` or stderr unless logging is configured otherwise):
+
+    {"event": "rerun", "script": "full_app.py", "total_ms": 41.2, "rows": 437,
+     "stages": {"load": 0.3, "sidebar": 6.1, "filter": 0.2, "store": 1.4, ...}}
+
+Every rerun is timed, at the cost of two ``perf_counter`` calls per stage,
+since the same timings feed the Prometheus metrics. The panel, the log and
+profiling only happen in the debug mode.
+
+``Profile`` wraps ``cProfile`` around a single rerun. Its report is a text
+summary plus the raw stats, which load in ``pstats``, snakeviz and similar
+tools.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import marshal
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("lodestar.timing")
+
+# Where the JSON lines go when nothing else configured the logger
+LOG_PATH_ENV = "LODESTAR_TIMING_LOG"
+
+
+class RerunTimer:
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self.started = clock()
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.stages.append((name, self._clock() - started))
+
+    def total(self):
+        return self._clock() - self.started
+
+    def breakdown(self):
+        """``{stage: milliseconds}``, summing repeated stages, in first-run order."""
+        result = {}
+        for name, seconds in self.stages:
+            result[name] = result.get(name, 0.0) + seconds * 1000
+        return result
+
+    def record(self, **fields):
+        """The rerun as a JSON-ready dict; ``fields`` are added as-is."""
+        return {
+            "event": "rerun",
+            **fields,
+            "total_ms": round(self.total() * 1000, 3),
+            "stages": {name: round(ms, 3) for name, ms in self.breakdown().items()},
+        }
+
+    def log(self, **fields):
+        record = self.record(**fields)
+        logger.info(json.dumps(record, default=str))
+        return record
+
+
+_handler_lock = threading.Lock()
+
+
+def ensure_log_handler():
+    """Send the timing log to ``$LODESTAR_TIMING_LOG`` (or stderr) unless already configured."""
+    with _handler_lock:
+        if logger.handlers:
+            return
+        path = os.environ.get(LOG_PATH_ENV)
+        handler = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def log_event(event, seconds, **fields):
+    """Log one timed event outside a rerun (e.g. building an export on click)."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"event": event, **fields, "ms": round(seconds * 1000, 3)}, default=str))
+
+
+class Profile:
+    """``cProfile`` over one rerun; ``stop`` returns ``(summary text, raw stats bytes)``."""
+
+    def __init__(self):
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def stop(self, limit=40, sort="cumulative"):
+        self._profiler.disable()
+        out = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=out)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        # Same bytes ``Stats.dump_stats`` writes to a .prof file
+        self._profiler.create_stats()
+        return out.getvalue(), marshal.dumps(self._profiler.stats)
@@ -0,0 +1,407 @@
+"""Page layouts shared by the publisher apps.
+
+Every app runs the same pipeline, ``run_pipeline``. It loads the shared
+dataset, draws the sidebar filters, runs the indexed filter engine and opens
+the tag store. The apps differ only in which of the views below they put on
+the page, so a change to loading, filtering, tagging or exporting lands once
+for every deployment variant.
+
+    app = run_pipeline()
+
+    def results(app):
+        tabs = st.tabs(["📋 All Publishers", "📌 Follow-Up View"])
+        with tabs[0]:
+            grid_view(app, "🎮 All Publishers (Grid View)")
+        with tabs[1]:
+            followup_view(app)
+
+    show_results(app, results)
+
+``show_results`` draws the views as a fragment, so paging, tagging and the
+export options rerun only the results, not the sidebar and the pipeline.
+With ``?filters=apply`` (or ``$LODESTAR_FILTER_MODE=apply``) the sidebar
+filters also wait for an Apply button, so adjusting several of them costs
+one rerun instead of one each.
+
+Every pipeline stage and view is timed; ``finish`` records the rerun in
+the metrics and, in the debug mode (``?debug=1``), logs it and shows the
+timings in the sidebar.
+"""
+
+import contextlib
+import functools
+import os
+import re
+import string
+from collections import defaultdict, namedtuple
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from publisher_core import metrics
+from publisher_core.filters import RefinementSession, filter_rows, tagged_rows
+from publisher_core.loader import PLATFORM_LIST, load_publishers
+from publisher_core.memory import note_session
+from publisher_core.store import NO_FOLLOWUP, open_store
+from publisher_core.tags import TAG_OPTIONS
+from publisher_core.timing import RerunTimer
+from publisher_core.widgets import (
+    CardWindow, batched_filters, contact_dates, contact_queue, debug_panel, export_button, format_tags, memory_panel,
+    pending_writes, start_rerun, tag_editor,
+)
+
+PAGE_SIZE = 50
+TABLE_COLUMNS = ["Publisher", "Genres", "Platforms", "budget range", "Contact name", "email"]
+
+
+_CONTEXT_FIELDS = ["data", "rows", "store", "writes", "timer", "profile", "debug_slot"]
+
+
+class AppContext(namedtuple("AppContext", _CONTEXT_FIELDS)):
+    """What one rerun of the pipeline produced.
+
+    ``rows`` are the matching row ids (for ``grouped_df.iloc``); views take
+    only the rows they draw, never the whole result. ``timer``
+    times the rerun's stages for the metrics and the debug panel.
+    """
+
+    __slots__ = ()
+
+    @property
+    def grouped_df(self):
+        return self.data.grouped_df
+
+    def tags(self, frame):
+        """``{publisher: [tags]}`` for the publishers in ``frame``.
+
+        Views ask for the rows they draw, not the whole filtered set; filtering
+        by tag goes through the store's tag index instead.
+        """
+        return self.store.tags(frame["Publisher"])
+
+
+# ─── Pipeline ───────────────────────────────────────────────────────────────────
+
+
+def sidebar_filters(genres_list, platform_list=PLATFORM_LIST, batched=False):
+    """The filter widgets; returns the ``filter_rows`` arguments they select.
+
+    With ``batched`` they sit in a form: changes apply together when Apply is
+    clicked (or Enter is pressed in the keyword box), in one rerun.
+    """
+    st.header("🔍 Filter Options")
+    with st.form("filters", border=False) if batched else contextlib.nullcontext():
+        selected_genres = st.multiselect("🎮 Select Genre(s):", genres_list)
+        selected_platforms = st.multiselect("🕹️ Select Platform(s):", platform_list)
+        max_budget = st.slider("💰 Max Budget ($)", 0, 5_000_000, 300_000, step=50_000)
+        only_with_contacts = st.checkbox("✅ Only if contact/email exists")
+        keyword = st.text_input("🔎 Keyword (Publisher / Genre / Platform / Contact):", "")
+        fuzzy_search = st.checkbox("🪄 Fuzzy match publisher names (typo-tolerant)")
+        if batched:
+            st.form_submit_button("✅ Apply filters", type="primary", width="stretch")
+    return selected_genres, selected_platforms, max_budget, only_with_contacts, keyword, fuzzy_search
+
+
+def run_pipeline():
+    """Load, filter and open the tag store for this rerun."""
+    timer, profile, debug_slot = start_rerun()
+    metrics.start_from_env()
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        note_session(ctx.session_id)
+
+    # Parsed once per process; re-read only when the workbook changes on disk
+    with timer.stage("load"):
+        data = load_publishers()
+
+    with st.sidebar:
+        with timer.stage("sidebar"):
+            selection = sidebar_filters(data.genres_list, batched=batched_filters())
+            memory_panel()
+
+    # All sidebar filters run against the dataset's prebuilt indexes; a selection
+    # that narrows this session's previous one only re-checks the previous rows
+    with timer.stage("filter"):
+        refine_session = st.session_state.setdefault("refine_session", RefinementSession())
+        rows = filter_rows(data, *selection, session=refine_session)
+
+    # Tags and contact dates persist in the shared store; the changes this
+    # session's widgets staged since the last rerun are written in one transaction
+    with timer.stage("store"):
+        store = open_store()
+        writes = pending_writes(store)
+        writes.commit()
+    return AppContext(data, rows, store, writes, timer, profile, debug_slot)
+
+
+def finish(app, fragment=False):
+    """End of the rerun: record its metrics, and in the debug mode log and show its timings.
+
+    A ``fragment`` rerun is logged but can't redraw the panel, which sits
+    outside the fragment.
+    """
+    ctx = get_script_run_ctx()
+    script = os.path.basename(ctx.main_script_path) if ctx else None
+    metrics.observe_rerun(script or "unknown", app.timer, len(app.rows), fragment=fragment)
+    if app.debug_slot is None:
+        return
+    app.timer.log(
+        script=script,
+        session=ctx.session_id if ctx else None,
+        rows=len(app.rows),
+        profiled=app.profile is not None,
+        fragment=fragment,
+    )
+    if not fragment:
+        debug_panel(app.debug_slot, app.timer, app.profile)
+
+
+def _fragment_rerun():
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+
+def _refresh(app):
+    """``app`` for a rerun of the results fragment alone.
+
+    The load, sidebar and filters didn't run, so the last full run's rows
+    stand; only the writes the fragment's widgets staged are committed.
+    """
+    timer = RerunTimer()
+    with timer.stage("store"):
+        writes = pending_writes(app.store)
+        writes.commit()
+    return app._replace(writes=writes, timer=timer, profile=None)
+
+
+def show_results(app, layout):
+    """Draw ``layout(app)`` as the results fragment, then finish the rerun.
+
+    Widgets inside the views (paging, the tag table, contact dates, export
+    options) rerun only this fragment. The sidebar filters and anything
+    drawn before this call rerun the whole app, as before.
+    """
+
+    @st.fragment
+    def results():
+        if _fragment_rerun():
+            current = _refresh(app)
+            layout(current)
+            finish(current, fragment=True)
+        else:
+            layout(app)
+
+    results()
+    finish(app)
+
+
+def _timed(stage):
+    """Time a view as ``stage`` of the rerun."""
+
+    def decorate(view):
+        @functools.wraps(view)
+        def timed(app, *args, **kwargs):
+            with app.timer.stage(stage):
+                return view(app, *args, **kwargs)
+
+        return timed
+
+    return decorate
+
+
+# ─── Cards ──────────────────────────────────────────────────────────────────────
+
+
+def widget_key(row):
+    """A key unique to one publisher, safe to use in widget keys."""
+    raw_key = f"{row['Publisher']}_{row['email'].split(';')[0]}"
+    return re.sub(r"[^a-zA-Z0-9_]", "_", raw_key)
+
+
+def publisher_card(row, tags_dict=None, two_columns=True):
+    """Genres, platforms, budget, contacts and (given ``tags_dict``) tags of one publisher.
+
+    Returns the contacts column, so callers can add to the card.
+    """
+    if two_columns:
+        left, right = st.columns([2, 3])
+    else:
+        left = right = st.container()
+    with left:
+        st.write(f"🎯 **Genres**: {row['Genres']}")
+        st.write(f"🖥️ **Platforms**: {row['Platforms']}")
+        st.write(f"💸 **Budget**: {row['budget range']}")
+    with right:
+        st.write(f"👤 **Contacts**: {row['Contact name']}")
+        st.write(f"📧 **Emails**: {row['email']}")
+        if tags_dict is not None:
+            st.write(f"🏷️ **Tags**: {format_tags(tags_dict.get(row['Publisher']))}")
+    return right
+
+
+def _tag_editor_section(app, frame, tags_dict, key, label="🏷️ Edit tags for these publishers"):
+    # One table tags every publisher shown, instead of a widget per card
+    with st.expander(label, expanded=False):
+        tag_editor(frame, tags_dict, key=key, writes=app.writes)
+
+
+def _export_section(app, rows, file_stem, key, heading="### 📥 Download Filtered Results"):
+    st.markdown(heading)
+    export_button(app.data, rows, file_stem, key=key)
+
+
+def _results_subheader(app):
+    st.subheader(f"📋 Filtered Results: {len(app.rows)} matches")
+
+
+# ─── Views ──────────────────────────────────────────────────────────────────────
+
+
+@_timed("render.cards")
+def card_list_view(app, title, key="all_publishers", file_stem="filtered_publishers_grouped"):
+    """One expander card per publisher, a window at a time."""
+    st.title(title)
+    _results_subheader(app)
+
+    # Only a window of cards is rendered per rerun; Previous/Next slide it
+    window = CardWindow(app.grouped_df, app.rows, key)
+    tags_dict = app.tags(window.visible())
+    _tag_editor_section(app, window.visible(), tags_dict, key)
+    for _, _, row in window.rows():
+        with st.expander(f"{row['Publisher']}", expanded=False):
+            publisher_card(row, tags_dict)
+    window.controls()
+
+    _export_section(app, app.rows, file_stem, key=f"{key}_export")
+
+
+@_timed("render.grid")
+def grid_view(app, title, key="grid", file_stem="filtered_publishers_grid"):
+    """Cards in a 3-column grid, a window at a time."""
+    st.title(title)
+    _results_subheader(app)
+
+    window = CardWindow(app.grouped_df, app.rows, key)
+    tags_dict = app.tags(window.visible())
+    _tag_editor_section(app, window.visible(), tags_dict, key)
+    cols = st.columns(3)
+    for position, _, row in window.rows():
+        with cols[position % 3]:
+            with st.expander(f"{row['Publisher']}", expanded=False):
+                publisher_card(row, tags_dict, two_columns=False)
+    window.controls()
+
+    _export_section(app, app.rows, file_stem, key=f"{key}_export")
+
+
+@_timed("render.accordion")
+def accordion_view(app, title, key="accordion", file_stem="filtered_publishers_az"):
+    """Publishers listed under one expander per initial, A–Z."""
+    st.title(title)
+    _results_subheader(app)
+
+    # Group one window of publishers by first character (digits grouped under "0–9")
+    window = CardWindow(app.grouped_df, app.rows, key, size=200)
+    groups = defaultdict(list)
+    for _, _, row in window.rows():
+        first_char = row["Publisher"][0].upper()
+        if not first_char.isalpha():
+            first_char = "0–9"
+        groups[first_char].append(row)
+
+    for letter in ["0–9"] + list(string.ascii_uppercase):
+        if letter in groups:
+            with st.expander(letter, expanded=False):
+                for row in groups[letter]:
+                    st.write(f"• **{row['Publisher']}**  —  Genres: {row['Genres']}, Platforms: {row['Platforms']}")
+                st.write("")  # spacing
+    window.controls()
+
+    _export_section(app, app.rows, file_stem, key=f"{key}_export")
+
+
+def _set_page(state_key, page):
+    st.session_state[state_key] = page
+
+
+@_timed("render.pages")
+def paginated_view(app, title, key="page", page_size=PAGE_SIZE):
+    """Pages of ``page_size`` publishers, as a table and as cards."""
+    total = len(app.rows)
+    total_pages = max(1, -(-total // page_size))
+    state_key = f"_page_{key}"
+    # A narrower filter can leave the saved page past the end
+    page = min(st.session_state.get(state_key, 0), total_pages - 1)
+    start, end = page * page_size, min((page + 1) * page_size, total)
+
+    st.title(title)
+    st.subheader(f"📋 Showing {start + 1 if total else 0}-{end} of {total} publishers")
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        st.button(
+            "◀ Previous", key=f"{state_key}_prev", disabled=page == 0,
+            on_click=_set_page, args=(state_key, page - 1),
+        )
+    with col2:
+        page_text = f"Page {page + 1} of {total_pages}"
+        st.markdown(f"<div style='text-align: center; font-weight: bold;'>{page_text}</div>", unsafe_allow_html=True)
+    with col3:
+        st.button(
+            "Next ▶", key=f"{state_key}_next", disabled=page >= total_pages - 1,
+            on_click=_set_page, args=(state_key, page + 1),
+        )
+
+    page_rows = app.rows[start:end]
+    page_df = app.grouped_df.iloc[page_rows]
+    sub_tabs = st.tabs(["Table View", "Card View"])
+
+    with sub_tabs[0]:
+        st.write("#### Table View of Publishers")
+        st.dataframe(page_df[TABLE_COLUMNS], width="stretch")
+
+    with sub_tabs[1]:
+        st.write("#### Card View of Publishers")
+        tags_dict = app.tags(page_df)
+        _tag_editor_section(app, page_df, tags_dict, key, label="🏷️ Edit tags for this page")
+        cols = st.columns(3)
+        for position, (_, row) in enumerate(page_df.iterrows()):
+            with cols[position % 3]:
+                with st.expander(f"{row['Publisher']}"):
+                    publisher_card(row, tags_dict, two_columns=False)
+
+    _export_section(
+        app, page_rows, f"filtered_publishers_page_{page + 1}", key=f"{key}_export",
+        heading="### 📥 Download Current Page Results",
+    )
+
+
+@_timed("render.followup")
+def followup_view(app, key="followup"):
+    """The contact queue, then tagged publishers with their contact dates."""
+    st.title("📌 Follow-Up View")
+    st.subheader("Filter by tag and schedule next contact")
+
+    # The standup list comes straight from the store's sorted due-date index
+    st.markdown("### 📆 Who to contact next")
+    contact_queue(app.data, app.store, key=f"{key}_queue")
+
+    followup_tags = st.multiselect(
+        "🧷 Select tag(s) to view (publishers must have all of them):",
+        TAG_OPTIONS,
+        default=[TAG_OPTIONS[0]],
+        key=f"{key}_tags",
+    )
+
+    # The reverse tag index finds the tagged publishers directly; only those
+    # within the current filters are listed, and only their dates are loaded
+    followup_rows = tagged_rows(app.data, app.store.publishers_with(followup_tags), within=app.rows)
+    followup_df = app.grouped_df.iloc[followup_rows]
+    followups = app.store.followups(followup_df["Publisher"])
+
+    for _, row in followup_df.iterrows():
+        with st.expander(f"📍 {row['Publisher']}", expanded=False):
+            with publisher_card(row):
+                contact_dates(row["Publisher"], followups.get(row["Publisher"], NO_FOLLOWUP), widget_key(row), app.writes)
+    if followup_df.empty:
+        st.write("No publishers found with that tag.")
@@ -0,0 +1,320 @@
+"""Streamlit widgets shared by the publisher apps."""
+
+import datetime
+import hashlib
+import os
+import time
+
+import streamlit as st
+
+from publisher_core.export import FORMATS, available_formats, lazy_export
+from publisher_core.memory import format_bytes, memory_report
+from publisher_core.store import NO_FOLLOWUP
+from publisher_core.tags import TAG_OPTIONS, tag_edits, tag_table
+from publisher_core.timing import Profile, RerunTimer, ensure_log_handler
+
+
+def memory_panel():
+    """Collapsed sidebar panel with this process's memory report."""
+    with st.expander("🧠 Memory (this process)", expanded=False):
+        report = memory_report()
+        cache = report["result_cache"]
+        sessions = report["active_sessions"]
+        st.write(f"🖥️ **Process RSS**: {format_bytes(report['rss_bytes'])}")
+        st.write(f"👥 **Active sessions**: {'n/a' if sessions is None else sessions}")
+        st.write(f"📚 **Shared dataset**: {format_bytes(report['dataset_bytes'])}")
+        st.write(f"🗂️ **Indexes**: {format_bytes(report['index_bytes'])}")
+        st.write(
+            f"♻️ **Result cache**: {cache['entries']} entries, {format_bytes(cache['bytes'])}, "
+            f"{cache['hit_ratio']:.0%} hits"
+        )
+        exports = report["export_cache"]
+        st.write(f"📥 **Export cache**: {exports['entries']} files, {format_bytes(exports['bytes'])}")
+
+
+# ─── Filter Mode ────────────────────────────────────────────────────────────────
+
+FILTER_MODE_ENV = "LODESTAR_FILTER_MODE"
+
+
+def batched_filters():
+    """True when the sidebar filters wait for an Apply button.
+
+    Set ``$LODESTAR_FILTER_MODE=apply`` or open the page with ``?filters=apply``;
+    otherwise every filter change reruns the app as it happens.
+    """
+    if os.environ.get(FILTER_MODE_ENV, "").lower() == "apply":
+        return True
+    return st.query_params.get("filters", "").lower() == "apply"
+
+
+# ─── Debug Timings ──────────────────────────────────────────────────────────────
+
+DEBUG_ENV = "LODESTAR_DEBUG"
+
+
+def debug_mode():
+    """True when ``$LODESTAR_DEBUG`` is set or the page was opened with ``?debug=1``."""
+    if os.environ.get(DEBUG_ENV, "").lower() in ("1", "true", "yes"):
+        return True
+    return st.query_params.get("debug", "").lower() in ("1", "true", "yes")
+
+
+def _profile_next_rerun():
+    st.session_state["_profile_next"] = True
+
+
+def start_rerun():
+    """``(timer, profile, debug panel slot)`` for this rerun.
+
+    Outside the debug mode there is no profile or panel slot, and nothing is
+    drawn or logged.
+    """
+    if not debug_mode():
+        return RerunTimer(), None, None
+    ensure_log_handler()
+    # Set by the panel's button; the rerun the click triggers is the one profiled
+    profile = Profile() if st.session_state.pop("_profile_next", False) else None
+    return RerunTimer(), profile, st.sidebar.empty()
+
+
+def debug_panel(slot, timer, profile=None):
+    """Fill the sidebar ``slot`` with this rerun's stage timings and the last profile."""
+    if profile is not None:
+        st.session_state["_rerun_profile"] = profile.stop()
+    with slot.container():
+        with st.expander("⏱️ Rerun timings", expanded=True):
+            breakdown = timer.breakdown()
+            st.write(f"**Total**: {timer.total() * 1000:.1f} ms")
+            for name, ms in breakdown.items():
+                st.write(f"• {name}: {ms:.1f} ms")
+            st.button("🔬 Profile next rerun", key="_profile_button", on_click=_profile_next_rerun)
+            saved = st.session_state.get("_rerun_profile")
+            if saved:
+                text, raw = saved
+                st.download_button(
+                    "Download profile (.prof)", data=raw, file_name="rerun.prof",
+                    mime="application/octet-stream", on_click="ignore", key="_profile_download",
+                )
+                st.code(text, language=None)
+
+
+# ─── Windowed Card Lists ────────────────────────────────────────────────────────
+
+CARD_WINDOW = 30
+RENDER_BUDGET_S = 0.5
+
+
+class CardWindow:
+    """Renders a sliding window of a result instead of every matching row.
+
+    ``rows`` are the result's row ids in ``frame``; only the ``size`` rows in
+    the window are taken from it per rerun, and rendering also stops early
+    once ``time_budget`` seconds are spent, so the page payload and the
+    server's render time stay flat however many publishers match. The window
+    resets to the top whenever the result itself changes.
+
+        window = CardWindow(grouped_df, rows, "all_publishers")
+        for position, idx, row in window.rows():
+            ...  # one card
+        window.controls()
+    """
+
+    def __init__(self, frame, rows, key, size=CARD_WINDOW, time_budget=RENDER_BUDGET_S):
+        self.frame = frame
+        self.row_ids = rows
+        self.size = size
+        self.time_budget = time_budget
+        self._state_key = f"_card_window_{key}"
+        self._signature = (len(rows), hash(rows.tobytes()))
+        saved = st.session_state.get(self._state_key)
+        start = saved[1] if saved and saved[0] == self._signature else 0
+        self.start = min(start, max(len(rows) - 1, 0))
+        self.stop = self.start
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    def visible(self):
+        """The rows this window shows (before any early stop for the time budget)."""
+        return self.frame.iloc[self.row_ids[self.start:self.start + self.size]]
+
+    def rows(self):
+        """Yield ``(position, index label, row)`` for the rows in the window."""
+        started = time.perf_counter()
+        window = self.visible()
+        for position, (idx, row) in enumerate(window.iterrows(), self.start):
+            yield position, idx, row
+            self.stop = position + 1
+            if self.time_budget is not None and time.perf_counter() - started > self.time_budget:
+                break
+
+    def _move(self, start):
+        st.session_state[self._state_key] = (self._signature, start)
+
+    def controls(self):
+        total = len(self)
+        if total <= self.size and self.start == 0 and self.stop >= total:
+            return
+        col1, col2, col3 = st.columns([1, 3, 1])
+        with col1:
+            st.button(
+                "◀ Previous", key=f"{self._state_key}_prev", disabled=self.start == 0,
+                on_click=self._move, args=(max(0, self.start - self.size),),
+            )
+        with col2:
+            st.caption(f"Showing {self.start + 1}–{self.stop} of {total} publishers")
+        with col3:
+            st.button(
+                "Next ▶", key=f"{self._state_key}_next", disabled=self.stop >= total,
+                on_click=self._move, args=(self.stop,),
+            )
+
+
+# ─── Bulk Tag Editor ────────────────────────────────────────────────────────────
+
+
+def format_tags(tags):
+    return ", ".join(tags) if tags else "—"
+
+
+def pending_writes(store):
+    """This session's staged tag and date changes.
+
+    Widget callbacks stage into it before a rerun starts; the app commits it
+    once, at the top of the script, so a rerun costs one transaction.
+    """
+    writes = st.session_state.get("_crm_writes")
+    if writes is None or writes.store is not store:
+        writes = st.session_state["_crm_writes"] = store.batch()
+    return writes
+
+
+def _stage_tag_edits(widget_key, publishers, writes):
+    edited_rows = st.session_state[widget_key]["edited_rows"]
+    # edited_rows grows with every edit; remember what was staged so each
+    # callback stages only its own change. Editors no longer shown are dropped.
+    seen = {k: v for k, v in st.session_state.get("_tag_editor_seen", {}).items() if k in st.session_state}
+    for publisher, tag, on in tag_edits(publishers, edited_rows, seen.get(widget_key)):
+        writes.set_tag(publisher, tag, on)
+    seen[widget_key] = {position: dict(columns) for position, columns in edited_rows.items()}
+    st.session_state["_tag_editor_seen"] = seen
+
+
+def tag_editor(frame, tags_dict, key, writes):
+    """One editable table tagging every publisher in ``frame``.
+
+    Replaces a multiselect per card, so the widget count no longer grows with
+    the number of publishers shown. Changed cells are staged into ``writes``.
+    """
+    publishers = frame["Publisher"].tolist()
+    # A new set of rows gets a fresh widget, so edits never land on the wrong row
+    rows_digest = hashlib.blake2b("\0".join(publishers).encode("utf-8"), digest_size=8).hexdigest()
+    widget_key = f"_tag_editor_{key}_{rows_digest}"
+    st.data_editor(
+        tag_table(publishers, tags_dict),
+        key=widget_key,
+        hide_index=True,
+        width="stretch",
+        disabled=["Publisher"],
+        column_config={tag: st.column_config.CheckboxColumn(tag) for tag in TAG_OPTIONS},
+        on_change=_stage_tag_edits,
+        args=(widget_key, publishers, writes),
+    )
+
+
+def _stage_date(widget_key, publisher, field, writes):
+    writes.set_followup(publisher, **{field: st.session_state[widget_key]})
+
+
+def contact_dates(publisher, saved, key, writes):
+    """The Last Contacted / Next Contact Date inputs for one publisher.
+
+    They start from the stored ``Followup`` and stage changes into ``writes``.
+    """
+    for field, label, prefix in (
+        ("last_contacted", "📅 Last Contacted", "last_contact"),
+        ("next_contact", "🗓️ Next Contact Date", "next_contact"),
+    ):
+        widget_key = f"{prefix}_{key}"
+        st.date_input(
+            label, value=getattr(saved, field), key=widget_key,
+            on_change=_stage_date, args=(widget_key, publisher, field, writes),
+        )
+
+
+# ─── Contact Queue ──────────────────────────────────────────────────────────────
+
+QUEUE_WINDOWS = ("⏰ Overdue", "📍 Due today", "🗓️ Due soon")
+
+
+def due_window(choice, today, days):
+    """``(start, end)`` dates for one of ``QUEUE_WINDOWS``."""
+    if choice == QUEUE_WINDOWS[0]:
+        return None, today - datetime.timedelta(days=1)
+    if choice == QUEUE_WINDOWS[1]:
+        return today, today
+    return today, today + datetime.timedelta(days=days)
+
+
+def contact_queue(dataset, store, key="queue"):
+    """Who to contact next: overdue, due today or due in the next N days, soonest first.
+
+    Read from the store's sorted due-date index, so the list costs the same
+    however many publishers are tracked. It covers everyone, not just the
+    sidebar's current filter.
+    """
+    today = datetime.date.today()
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        choice = st.radio("📆 Contact queue:", QUEUE_WINDOWS, horizontal=True, key=f"{key}_window")
+    with col2:
+        days = st.number_input("Days ahead", 1, 90, 7, key=f"{key}_days", disabled=choice != QUEUE_WINDOWS[2])
+
+    rows, due_dates = [], []
+    for pid, day in store.due_between(*due_window(choice, today, days)):
+        for row in dataset.index.rows_for([pid]):
+            rows.append(row)
+            due_dates.append(day)
+    if not rows:
+        st.write("Nobody in this window.")
+        return
+
+    queue = dataset.grouped_df.iloc[rows][["Publisher", "Contact name", "email"]]
+    saved = store.followups(queue["Publisher"])
+    queue.insert(1, "Next Contact", due_dates)
+    queue.insert(2, "Last Contacted", [saved.get(name, NO_FOLLOWUP).last_contacted for name in queue["Publisher"]])
+    st.caption(f"{len(queue)} publishers, soonest first")
+    st.dataframe(queue, hide_index=True, width="stretch")
+
+
+# ─── Export ─────────────────────────────────────────────────────────────────────
+
+EXPORT_LABELS = {
+    "xlsx": "Excel (.xlsx)",
+    "csv": "CSV",
+    "csv.gz": "CSV, gzipped",
+    "parquet": "Parquet",
+    "jsonl": "JSON Lines",
+}
+
+
+def export_button(dataset, rows, file_stem, key):
+    """Format picker, a one-row-per-contact option and a download button for ``rows``.
+
+    The file is only generated when the button is clicked, then cached.
+    """
+    col1, col2 = st.columns([2, 3])
+    with col1:
+        fmt = st.selectbox("Format", available_formats(), format_func=EXPORT_LABELS.get, key=f"{key}_format")
+    with col2:
+        explode = st.checkbox("One row per contact", key=f"{key}_explode")
+    extension, mime = FORMATS[fmt]
+    st.download_button(
+        label=f"Download as {EXPORT_LABELS[fmt]}",
+        data=lazy_export(dataset, rows, fmt, explode),
+        file_name=f"{file_stem}.{extension}",
+        mime=mime,
+        on_click="ignore",
+        key=f"{key}_download",
+    )
@@ -0,0 +1,16 @@
+import pytest
+
+from benchmarks.generate import generate_contacts, write_workbook
+from publisher_core.loader import PublisherDataset, publishers_from_frame
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    """About 2,000 synthetic publishers, shaped like the master sheet."""
+    return PublisherDataset(publishers_from_frame(generate_contacts(3_000, seed=1)), "test-version")
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """A small generated .xlsx in its own folder, so its snapshots land there too."""
+    return write_workbook(generate_contacts(200, seed=2), str(tmp_path / "contacts.xlsx"))
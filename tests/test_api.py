@@ -0,0 +1,130 @@
+"""The HTTP API through PublisherAPI.handle, without a server."""
+
+import gzip
+import json
+
+import pytest
+
+from publisher_core.api import DEFAULT_LIMIT, PublisherAPI
+from publisher_core.filters import filter_rows
+
+
+@pytest.fixture(scope="module")
+def api(dataset):
+    return PublisherAPI(dataset=dataset)
+
+
+def get(api, target, **headers):
+    response = api.handle("GET", target, headers)
+    body = response.body
+    if response.headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return response, json.loads(body) if body else None
+
+
+def test_publishers_page_and_projection(api, dataset):
+    response, payload = get(api, "/publishers?platforms=pc&fields=Publisher,email&limit=5")
+    assert response.status == 200
+    rows = filter_rows(dataset, platforms=("pc",))
+    assert payload["total"] == len(rows)
+    assert payload["count"] == 5
+    assert [item["Publisher"] for item in payload["items"]] == dataset.grouped_df["Publisher"].iloc[rows[:5]].tolist()
+    assert all(set(item) == {"Publisher", "email"} for item in payload["items"])
+
+
+def test_cursor_walks_every_match_once(api, dataset):
+    target = "/publishers?genres=rpg&fields=Publisher&limit=37"
+    names, cursor = [], None
+    while True:
+        _, payload = get(api, target + (f"&cursor={cursor}" if cursor else ""))
+        names.extend(item["Publisher"] for item in payload["items"])
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            break
+    rows = filter_rows(dataset, genres=("rpg",))
+    assert names == dataset.grouped_df["Publisher"].iloc[rows].tolist()
+
+
+def test_default_limit(api):
+    _, payload = get(api, "/publishers")
+    assert payload["count"] == DEFAULT_LIMIT
+
+
+@pytest.mark.parametrize("target, status", [
+    ("/publishers?limit=0", 400),
+    ("/publishers?limit=1001", 400),
+    ("/publishers?limit=many", 400),
+    ("/publishers?has_contact=maybe", 400),
+    ("/publishers?fields=Publisher,phone", 400),
+    ("/publishers?cursor=garbage", 400),
+    ("/publishers?genre=rpg", 400),
+    ("/publishers?max_buget=1000", 400),
+    ("/nowhere", 404),
+    ("/health", 200),
+    ("/facets", 200),
+])
+def test_status_codes(api, target, status):
+    response, payload = get(api, target)
+    assert response.status == status
+    if status >= 400:
+        assert "error" in payload
+
+
+def test_unknown_parameters_are_named(api):
+    response, payload = get(api, "/publishers?platforms=pc&max_buget=1000&genre=rpg")
+    assert response.status == 400
+    assert payload["error"].startswith("unknown key(s): genre, max_buget")
+
+
+def test_cursor_from_another_query_has_expired(api):
+    _, payload = get(api, "/publishers?genres=rpg&limit=5")
+    response, _ = get(api, f"/publishers?genres=indie&limit=5&cursor={payload['next_cursor']}")
+    assert response.status == 410
+
+
+def test_only_get_and_head_are_allowed(api):
+    response = api.handle("POST", "/publishers")
+    assert response.status == 405
+    assert response.headers["Allow"] == "GET, HEAD"
+
+
+def test_etag_revalidation(api):
+    response, _ = get(api, "/publishers?keyword=studio")
+    etag = response.headers["ETag"]
+    again, body = get(api, "/publishers?keyword=studio", **{"If-None-Match": etag})
+    assert again.status == 304 and body is None
+    other, _ = get(api, "/publishers?keyword=games", **{"If-None-Match": etag})
+    assert other.status == 200
+
+
+def test_gzip_and_plain_bodies_share_a_weak_etag(api):
+    plain = api.handle("GET", "/publishers?limit=50")
+    zipped = api.handle("GET", "/publishers?limit=50", {"Accept-Encoding": "gzip"})
+    assert plain.headers["ETag"].startswith('W/"')
+    assert zipped.headers["ETag"] == plain.headers["ETag"]
+    strong = plain.headers["ETag"].removeprefix("W/")
+    assert api.handle("GET", "/publishers?limit=50", {"If-None-Match": strong}).status == 304
+
+
+def test_gzip_when_accepted(api):
+    plain = api.handle("GET", "/publishers?limit=50")
+    zipped = api.handle("GET", "/publishers?limit=50", {"Accept-Encoding": "gzip, br"})
+    assert "Content-Encoding" not in plain.headers
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.body) == plain.body
+
+
+def test_unloadable_workbook_is_503(tmp_path):
+    response, payload = get(PublisherAPI(tmp_path / "missing.xlsx"), "/publishers")
+    assert response.status == 503
+    assert "missing.xlsx" in payload["error"]
+
+
+def test_unexpected_failure_is_a_json_500(api, monkeypatch):
+    def broken(params, headers):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(api._routes, "/facets", broken)
+    response, payload = get(api, "/facets")
+    assert response.status == 500
+    assert payload == {"error": "internal server error"}
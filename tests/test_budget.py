@@ -0,0 +1,61 @@
+"""Budget range strings, as the master sheet and its editors write them."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from publisher_core.budget import BUDGET_COLUMNS, STATUS_BLANK, STATUS_OK, STATUS_UNPARSED, add_budget_columns, parse_budgets
+
+INF = math.inf
+NAN = math.nan
+
+
+@pytest.mark.parametrize("text, low, high, status", [
+    # The sheet's own strings
+    ("< 250k", 0, 250_000, STATUS_OK),
+    ("+250k & < 500k", 250_000, 500_000, STATUS_OK),
+    ("+500k & < 1M", 500_000, 1_000_000, STATUS_OK),
+    ("+1M & < 2M", 1_000_000, 2_000_000, STATUS_OK),
+    ("< 250k, +250k & < 500k, +500k & < 1M, +1M & < 2M", 0, 2_000_000, STATUS_OK),
+    ("Open ended", 0, NAN, STATUS_UNPARSED),
+    # Other ways of writing a range
+    ("< 2M", 0, 2_000_000, STATUS_OK),
+    ("100k-300k", 100_000, 300_000, STATUS_OK),
+    ("100k to 300k", 100_000, 300_000, STATUS_OK),
+    ("1.5m", 1_500_000, 1_500_000, STATUS_OK),
+    ("1,500,000", 1_500_000, 1_500_000, STATUS_OK),
+    ("500k+", 500_000, INF, STATUS_OK),
+    ("> 2M", 2_000_000, INF, STATUS_OK),
+    ("over 1M", 1_000_000, INF, STATUS_OK),
+    ("up to 500k", 0, 500_000, STATUS_OK),
+    ("Under 250K", 0, 250_000, STATUS_OK),
+    # Units it doesn't know are not bare numbers
+    ("1 mil", 0, NAN, STATUS_UNPARSED),
+    ("100k - 2 bn", 0, NAN, STATUS_UNPARSED),
+    # Blanks
+    ("", 0, NAN, STATUS_BLANK),
+    ("   ", 0, NAN, STATUS_BLANK),
+    (None, 0, NAN, STATUS_BLANK),
+])
+def test_parse_budgets(text, low, high, status):
+    parsed = parse_budgets([text]).iloc[0]
+    assert parsed["Budget Min"] == low
+    assert parsed["Budget Max"] == high or (math.isnan(high) and math.isnan(parsed["Budget Max"]))
+    assert parsed["Budget Status"] == status
+
+
+def test_repeated_strings_are_parsed_alike():
+    values = pd.Series(["+1M & < 2M", None, "< 250k", "+1M & < 2M", None], index=[5, 3, 9, 1, 7])
+    parsed = parse_budgets(values)
+    assert parsed["Budget Min"].tolist() == [1_000_000, 0, 0, 1_000_000, 0]
+    assert parsed["Budget Status"].tolist() == [STATUS_OK, STATUS_BLANK, STATUS_OK, STATUS_OK, STATUS_BLANK]
+    assert parse_budgets([None, None])["Budget Status"].tolist() == [STATUS_BLANK, STATUS_BLANK]
+
+
+def test_budget_columns_follow_the_range_column():
+    frame = pd.DataFrame({"Publisher": ["A", "B"], "budget range": ["< 250k", "500k+"], "email": ["", ""]})
+    columns = add_budget_columns(frame).columns.tolist()
+    assert columns == ["Publisher", "budget range", *BUDGET_COLUMNS, "email"]
+    assert np.isinf(add_budget_columns(frame)["Budget Max"].iloc[1])
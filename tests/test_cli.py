@@ -0,0 +1,36 @@
+"""Query files for the command line: every line parses or names its error."""
+
+import pytest
+
+from publisher_core.api import QueryError
+from publisher_core.cli import DEFAULT_FIELDS, read_queries
+
+
+def test_json_and_query_string_lines():
+    queries = read_queries([
+        "# nightly exports",
+        '{"name": "rpg-pc", "genres": ["rpg"], "platforms": ["pc"], "has_contact": true}',
+        "",
+        "genres=strategy&max_budget=300000&keyword=Studio&fields=Publisher,email",
+    ])
+    assert [q.name for q in queries] == ["rpg-pc", "query-4"]
+    first, second = queries
+    assert (first.spec.genres, first.spec.platforms, first.spec.only_with_contacts) == (("rpg",), ("pc",), True)
+    assert first.fields == DEFAULT_FIELDS
+    assert (second.spec.max_budget, second.spec.keyword) == (300_000, "studio")
+    assert second.fields == ("Publisher", "email")
+
+
+@pytest.mark.parametrize("line, message", [
+    ('{"genres": ["rpg"]', "invalid JSON"),
+    ("genre=rpg", "unknown key(s): genre"),
+    ('{"keywrod": "studio"}', "unknown key(s): keywrod"),
+    ("fields=Publisher,phone", "unknown field(s): phone"),
+    ("max_budget=lots", "max_budget must be an integer"),
+    ("has_contact=maybe", "has_contact must be true or false"),
+])
+def test_errors_name_the_line(line, message):
+    with pytest.raises(QueryError) as error:
+        read_queries(["genres=rpg", "", line])
+    assert str(error.value).startswith("line 3: ")
+    assert message in str(error.value)
@@ -0,0 +1,102 @@
+"""Exports of a filter result, read back and compared with ``grouped_df.iloc[rows]``."""
+
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from publisher_core.cache import ResultCache
+from publisher_core.export import (
+    ExportError, available_formats, explode_contacts, export_bytes, lazy_export, rows_key, stream_export,
+)
+from publisher_core.loader import PublisherDataset
+
+READERS = {
+    "xlsx": lambda data: pd.read_excel(io.BytesIO(data)),
+    "csv": lambda data: pd.read_csv(io.BytesIO(data)),
+    "csv.gz": lambda data: pd.read_csv(io.BytesIO(gzip.decompress(data))),
+    "parquet": lambda data: pd.read_parquet(io.BytesIO(data)),
+    "jsonl": lambda data: pd.read_json(io.BytesIO(data), lines=True),
+}
+
+
+def normalized(frame):
+    # Blank strings and missing values look alike once written out
+    frame = frame.replace("", np.nan)
+    frame["Budget Max"] = pd.to_numeric(frame["Budget Max"])
+    return frame.astype(object).where(frame.notna(), None)
+
+
+@pytest.fixture(scope="module")
+def rows(dataset):
+    # Every third publisher, in reverse, as a ranked result would come
+    return np.arange(0, len(dataset), 3)[::-1].copy()
+
+
+@pytest.mark.parametrize("fmt", available_formats())
+def test_export_round_trip(dataset, rows, fmt):
+    exported = READERS[fmt](export_bytes(dataset, rows, fmt, cache=None))
+    expected = dataset.grouped_df.iloc[rows].reset_index(drop=True)
+    pd.testing.assert_frame_equal(normalized(exported), normalized(expected), check_dtype=False)
+
+
+@pytest.mark.parametrize("fmt", available_formats())
+def test_chunks_add_up_to_one_file(dataset, rows, fmt):
+    chunked = b"".join(stream_export(dataset, rows, fmt, explode=True, chunk_rows=97))
+    whole = READERS[fmt](b"".join(stream_export(dataset, rows, fmt, explode=True, chunk_rows=len(rows))))
+    pd.testing.assert_frame_equal(normalized(READERS[fmt](chunked)), normalized(whole), check_dtype=False)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_empty_result_keeps_the_header(dataset, fmt):
+    if fmt not in available_formats():
+        pytest.skip("Parquet export needs pyarrow")
+    exported = READERS[fmt](b"".join(stream_export(dataset, np.empty(0, dtype=np.int64), fmt)))
+    assert exported.columns.tolist() == dataset.grouped_df.columns.tolist() and exported.empty
+
+
+def test_unknown_format(dataset, rows):
+    with pytest.raises(ExportError, match="pdf"):
+        stream_export(dataset, rows, "pdf")
+
+
+def test_explode_pairs_names_and_emails_by_position():
+    frame = pd.DataFrame({
+        "Publisher": ["More emails", "More names", "Nobody", "Equal"],
+        "Contact name": ["Anna", "Ben; Chloe; David", "", "Eve; Finn"],
+        "email": ["anna@a.com; info@a.com", "ben@b.com", "", "eve@e.com; finn@e.com"],
+    }, index=[10, 11, 12, 13])
+    exploded = explode_contacts(frame)
+    assert exploded.to_dict("list") == {
+        "Publisher": ["More emails"] * 2 + ["More names"] * 3 + ["Nobody"] + ["Equal"] * 2,
+        "Contact name": ["Anna", "", "Ben", "Chloe", "David", "", "Eve", "Finn"],
+        "email": ["anna@a.com", "info@a.com", "ben@b.com", "", "", "", "eve@e.com", "finn@e.com"],
+    }
+    # The input frame (a view of the shared table) is left alone
+    assert frame["email"].iloc[0] == "anna@a.com; info@a.com"
+
+
+def test_cache_key_is_version_rows_format(dataset, rows):
+    cache = ResultCache()
+    first = export_bytes(dataset, rows, "xlsx", cache=cache)
+    assert export_bytes(dataset, rows.copy(), "xlsx", cache=cache) is first
+    assert len(cache) == 1
+    assert cache.get((dataset.version, rows_key(rows), "xlsx", False)) is first
+
+    # Another order, dataset version, format or explode: each its own entry
+    export_bytes(dataset, rows[::-1].copy(), "xlsx", cache=cache)
+    other = PublisherDataset(dataset.grouped_df, "other-version", dataset.genres_list)
+    export_bytes(other, rows, "xlsx", cache=cache)
+    export_bytes(dataset, rows, "csv", cache=cache)
+    export_bytes(dataset, rows, "xlsx", explode=True, cache=cache)
+    assert len(cache) == 5 and cache.hits == 2
+
+
+def test_lazy_export_builds_on_call(dataset, rows):
+    cache = ResultCache()
+    build = lazy_export(dataset, rows, "xlsx", cache=cache)
+    assert len(cache) == 0
+    assert build() is build()
+    assert len(cache) == 1
@@ -0,0 +1,133 @@
+"""The indexed filter chain against a row-by-row reimplementation of the sidebar."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from publisher_core.cache import ResultCache
+from publisher_core.filters import RefinementSession, filter_rows, tagged_rows
+from publisher_core.fuzzy import levenshtein
+from publisher_core.search import SEARCH_FIELDS
+from publisher_core.store import publisher_id
+
+
+def _terms(value):
+    return {t.strip().lower() for t in value.split(";") if t.strip()} if isinstance(value, str) else set()
+
+
+@pytest.fixture(scope="module")
+def records(dataset):
+    return dataset.grouped_df.to_dict("records")
+
+
+def brute_force(records, genres=(), platforms=(), max_budget=None, only_with_contacts=False, keyword=""):
+    keyword = keyword.strip().lower()
+    rows = []
+    for row, record in enumerate(records):
+        if genres and not _terms(record["Genres"]) & {g.lower() for g in genres}:
+            continue
+        if not {p.lower() for p in platforms} <= _terms(record["Platforms"]):
+            continue
+        if max_budget is not None and record["Budget Min"] > max_budget:
+            continue
+        if only_with_contacts and not (record["Contact name"].strip() or record["email"].strip()):
+            continue
+        texts = ["" if not isinstance(record[f], str) else record[f].lower() for f in SEARCH_FIELDS]
+        if keyword and not any(keyword in text for text in texts):
+            continue
+        rows.append(row)
+    return np.array(rows, dtype=np.int64)
+
+
+SELECTIONS = list(itertools.product(
+    [(), ("rpg",), ("rpg", "indie")],
+    [(), ("pc",), ("pc", "vr")],
+    [None, 250_000],
+    [False, True],
+    ["", "a", "ar", "games", "studio", "@", "zzzz"],
+))
+
+
+@pytest.mark.parametrize("selection", SELECTIONS)
+def test_filter_rows_matches_brute_force(dataset, records, selection):
+    expected = brute_force(records, *selection)
+    assert np.array_equal(filter_rows(dataset, *selection, cache=None), expected)
+
+
+def test_terms_match_exactly(dataset):
+    rows = filter_rows(dataset, genres=("action",), cache=None)
+    genres = dataset.grouped_df["Genres"].iloc[rows]
+    assert len(genres) and all("action" in _terms(value) for value in genres)
+    assert not len(filter_rows(dataset, genres=("act",), cache=None))
+
+
+def test_refinements_match_fresh_results(dataset, records):
+    session = RefinementSession()
+    steps = [
+        ((), (), None, False, "s"),
+        ((), (), None, False, "st"),
+        ((), ("pc",), None, False, "stu"),
+        ((), ("pc",), 500_000, True, "stu"),
+        (("rpg",), ("pc",), 250_000, True, "stud"),
+    ]
+    for selection in steps:
+        rows = filter_rows(dataset, *selection, cache=None, session=session)
+        assert np.array_equal(rows, brute_force(records, *selection))
+    assert session.refinements == len(steps) - 1
+
+
+def test_equivalent_selections_share_one_cached_result(dataset):
+    cache = ResultCache()
+    first = filter_rows(dataset, ("Rpg", "indie"), ("pc",), keyword=" Ar ", cache=cache)
+    second = filter_rows(dataset, ("indie", "rpg"), ("PC",), keyword="ar", cache=cache)
+    assert second is first and not first.flags.writeable
+    assert (len(cache), cache.hits, cache.misses) == (1, 1, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    rows = np.arange(1_000, dtype=np.int64)
+    cache = ResultCache(max_bytes=2 * (rows.nbytes + 256))
+    cache.put("a", rows.copy())
+    cache.put("b", rows.copy())
+    cache.get("a")
+    cache.put("c", rows.copy())
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert cache.evictions == 1
+
+
+def test_fuzzy_lookup_finds_a_misspelled_name(dataset):
+    name = dataset.grouped_df["Publisher"].iloc[10]
+    typo = name[:2] + name[3:]
+    rows = filter_rows(dataset, keyword=typo, fuzzy=True, cache=None)
+    assert 10 in rows[:5]
+
+
+def _edit_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def test_levenshtein_matches_dynamic_programming():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        a, b = ("".join(rng.choice(list("abc"), rng.integers(0, 8))) for _ in range(2))
+        assert levenshtein(a, b) == _edit_distance(a, b)
+        assert levenshtein(a, b, 1) == min(_edit_distance(a, b), 2)
+
+
+@pytest.mark.parametrize("ranked", [False, True])
+def test_tagged_rows_within_a_result(dataset, ranked):
+    names = dataset.grouped_df["Publisher"]
+    tagged = [publisher_id(name) for name in names.iloc[::7]]
+    within = filter_rows(dataset, platforms=("pc",), cache=None)
+    if ranked:
+        within = within[::-1]
+    expected = [row for row in range(len(names)) if row % 7 == 0 and row in set(within.tolist())]
+    assert tagged_rows(dataset, tagged, within=within).tolist() == expected
+    assert tagged_rows(dataset, tagged).tolist() == list(range(0, len(names), 7))
@@ -0,0 +1,53 @@
+"""The streaming ingest against the pandas path it replaces."""
+
+import pandas as pd
+import pytest
+
+from benchmarks.generate import COLUMNS, write_workbook
+from publisher_core.ingest import IngestError, stream_publishers
+from publisher_core.loader import group_publishers, normalize_contacts
+
+ROWS = [
+    # Blank URL and budget on the first row; the second row fills them in
+    ("Alpha Games", None, "PC; VR", "RPG", "Anna Adams", "anna@alpha.com", None),
+    ("Alpha Games", "https://alpha.com", "Mobile", "Action", "Anna Adams", "anna@alpha.com", "< 250k"),
+    ("Alpha Games", None, None, None, None, "info@alpha.com", "+1M & < 2M"),
+    ("Beta Soft", "https://beta.com", None, "Puzzle; Casual", None, None, "Open ended"),
+    ("alpha games", None, "Console", "Rpg", "Ben Bauer", None, None),
+    (None, "https://orphan.com", "PC", "Indie", "Nobody", "no@one.com", None),
+]
+
+
+def pandas_path(*paths):
+    frames = [pd.read_excel(path) for path in paths]
+    return group_publishers(normalize_contacts(pd.concat(frames, ignore_index=True)))
+
+
+def test_generated_workbook_matches_read_excel(workbook):
+    pd.testing.assert_frame_equal(stream_publishers(workbook), pandas_path(workbook))
+
+
+def test_edge_cases_match_read_excel(tmp_path):
+    path = write_workbook(pd.DataFrame(ROWS, columns=COLUMNS), str(tmp_path / "edge.xlsx"))
+    streamed = stream_publishers(path)
+    pd.testing.assert_frame_equal(streamed, pandas_path(path))
+    alpha = streamed.set_index("Publisher").loc["Alpha Games"]
+    assert (alpha["URL"], alpha["budget range"], alpha["Genres"]) == ("https://alpha.com", "< 250k", "rpg")
+    assert alpha["email"] == "anna@alpha.com; info@alpha.com"
+
+
+def test_several_workbooks_merge_like_one_sheet(tmp_path, workbook):
+    extra = write_workbook(pd.DataFrame(ROWS, columns=COLUMNS), str(tmp_path / "extra.xlsx"))
+    pd.testing.assert_frame_equal(stream_publishers([workbook, extra]), pandas_path(workbook, extra))
+
+
+def test_missing_url_column_reads_as_blank(tmp_path):
+    frame = pd.DataFrame(ROWS, columns=COLUMNS).drop(columns="URL")
+    path = write_workbook(frame, str(tmp_path / "partners.xlsx"))
+    assert stream_publishers(path)["URL"].isna().all()
+
+
+def test_missing_required_column(tmp_path):
+    path = write_workbook(pd.DataFrame(ROWS, columns=COLUMNS).drop(columns="email"), str(tmp_path / "bad.xlsx"))
+    with pytest.raises(IngestError, match="email"):
+        stream_publishers(path)
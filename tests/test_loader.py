@@ -0,0 +1,77 @@
+"""The process-wide loader cache: when a workbook is trusted, hashed or parsed again."""
+
+import os
+
+import pytest
+
+from benchmarks.generate import generate_contacts, write_workbook
+from publisher_core import loader
+from publisher_core.loader import load_publishers
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    loader.clear_cache()
+    yield
+    loader.clear_cache()
+
+
+def calls_to(monkeypatch, name):
+    """Record the arguments of every call to ``loader.<name>``."""
+    calls = []
+    original = getattr(loader, name)
+
+    def recorded(*args):
+        calls.append(args)
+        return original(*args)
+
+    monkeypatch.setattr(loader, name, recorded)
+    return calls
+
+
+def bump_mtime(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_unchanged_file_is_not_read_again(workbook, monkeypatch):
+    first = load_publishers(workbook)
+    digests = calls_to(monkeypatch, "file_digest")
+    builds = calls_to(monkeypatch, "build_dataset")
+    assert load_publishers(workbook) is first
+    assert digests == [] and builds == []
+
+
+def test_touched_file_is_hashed_but_not_parsed(workbook, monkeypatch):
+    first = load_publishers(workbook)
+    bump_mtime(workbook)
+    digests = calls_to(monkeypatch, "file_digest")
+    builds = calls_to(monkeypatch, "build_dataset")
+    assert load_publishers(workbook) is first
+    assert len(digests) == 1 and builds == []
+    # The new mtime is remembered, so the next load trusts it again
+    assert load_publishers(workbook) is first
+    assert len(digests) == 1
+
+
+def test_same_size_rewrite_with_new_content_is_loaded_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, "build_dataset", lambda path, digest: ("dataset", digest))
+    path = tmp_path / "contacts.xlsx"
+    path.write_bytes(b"a" * 64)
+    first = load_publishers(path)
+    path.write_bytes(b"b" * 64)
+    bump_mtime(path)
+    second = load_publishers(path)
+    assert second != first
+    assert second == ("dataset", loader.file_digest(path))
+
+
+def test_edited_workbook_is_parsed_again(workbook):
+    first = load_publishers(workbook)
+    write_workbook(generate_contacts(120, seed=3), workbook)
+    bump_mtime(workbook)
+    second = load_publishers(workbook)
+    assert second is not first
+    assert second.version == loader.file_digest(workbook) != first.version
+    assert second.grouped_df["Publisher"].tolist() != first.grouped_df["Publisher"].tolist()
+    assert loader.loaded_datasets() == [second]
@@ -0,0 +1,84 @@
+"""The columnar snapshot and saved indexes: round trips, invalidation, fallbacks."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from publisher_core import snapshot
+from publisher_core.filters import filter_rows
+from publisher_core.index import PublisherIndex
+from publisher_core.loader import PublisherDataset, build_dataset, file_digest, read_workbook
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def grouped(workbook):
+    return read_workbook(workbook)
+
+
+def test_snapshot_round_trip(workbook, grouped):
+    genres = ["action", "rpg"]
+    assert snapshot.write_snapshot(workbook, "v1", grouped, genres) == snapshot.snapshot_path(workbook)
+    grouped_df, genres_list = snapshot.read_snapshot(workbook, "v1")
+    pd.testing.assert_frame_equal(grouped_df, grouped)
+    assert genres_list == genres
+
+
+def test_index_round_trip(workbook, grouped):
+    built = PublisherIndex(grouped)
+    snapshot.write_index(workbook, "v1", built.state())
+    state = snapshot.read_index(workbook, "v1")
+    assert state.keys() == built.state().keys()
+    for name, value in built.state().items():
+        if isinstance(value, np.ndarray):
+            assert np.array_equal(state[name], value) and state[name].dtype == value.dtype
+            assert not state[name].flags.writeable
+        else:
+            assert state[name] == value
+
+    fresh = PublisherDataset(grouped, "v1")
+    restored = PublisherDataset(grouped, "v1", index_state=state)
+    for selection in [dict(genres=("rpg",)), dict(platforms=("pc", "mobile")), dict(keyword="games"),
+                      dict(keyword="games", fuzzy=True)]:
+        assert np.array_equal(filter_rows(restored, **selection, cache=None), filter_rows(fresh, **selection, cache=None))
+
+
+def test_other_digest_or_format_is_ignored(workbook, grouped, monkeypatch):
+    snapshot.write_snapshot(workbook, "v1", grouped, [])
+    snapshot.write_index(workbook, "v1", PublisherIndex(grouped).state())
+    assert snapshot.read_snapshot(workbook, "v2") is None
+    assert snapshot.read_index(workbook, "v2") is None
+
+    monkeypatch.setattr(snapshot, "INDEX_FORMAT", snapshot.INDEX_FORMAT + 1)
+    assert snapshot.read_snapshot(workbook, "v1") is not None
+    assert snapshot.read_index(workbook, "v1") is None
+
+    monkeypatch.undo()
+    monkeypatch.setattr(snapshot, "SNAPSHOT_FORMAT", snapshot.SNAPSHOT_FORMAT + 1)
+    assert snapshot.read_snapshot(workbook, "v1") is None
+    assert snapshot.read_index(workbook, "v1") is None
+
+
+def test_stale_snapshot_is_rebuilt(workbook, grouped):
+    snapshot.write_snapshot(workbook, "older", grouped.iloc[:5], [])
+    digest = file_digest(workbook)
+    dataset = build_dataset(workbook, digest)
+    assert len(dataset) == len(grouped)
+    assert len(snapshot.read_snapshot(workbook, digest)[0]) == len(grouped)
+    assert snapshot.read_index(workbook, digest) is not None
+
+
+@pytest.mark.parametrize("damaged", [snapshot.snapshot_path, snapshot.index_path])
+def test_corrupt_files_fall_back_to_a_rebuild(workbook, grouped, damaged):
+    digest = file_digest(workbook)
+    build_dataset(workbook, digest)
+    with open(damaged(workbook), "r+b") as fh:
+        fh.truncate(100)
+    dataset = build_dataset(workbook, digest)
+    pd.testing.assert_frame_equal(dataset.grouped_df, grouped)
+    assert np.array_equal(filter_rows(dataset, keyword="games", cache=None),
+                          filter_rows(PublisherDataset(grouped, digest), keyword="games", cache=None))
+    # ...and the damaged file is written again for the next process
+    assert snapshot.read_snapshot(workbook, digest) is not None
+    assert snapshot.read_index(workbook, digest) is not None
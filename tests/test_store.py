@@ -0,0 +1,102 @@
+"""The tag and follow-up store, and the write batches sessions stage into."""
+
+import datetime
+
+import pytest
+
+from publisher_core.store import NO_FOLLOWUP, CrmStore, Followup
+
+MAY_1, MAY_9 = datetime.date(2026, 5, 1), datetime.date(2026, 5, 9)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CrmStore(tmp_path / "crm.sqlite3")
+
+
+def test_batch_keeps_the_last_change_and_writes_once(store, monkeypatch):
+    writes = []
+    original = store.write
+
+    def counted_write(tags, followups):
+        writes.append(len(tags) + len(followups))
+        original(tags, followups)
+
+    monkeypatch.setattr(store, "write", counted_write)
+    batch = store.batch()
+    batch.set_tag("Alpha Games", "Contacted", True)
+    batch.set_tag("Alpha Games", "Contacted", False)
+    batch.set_tag("Alpha Games", "Good fit", True)
+    batch.set_followup("Alpha Games", next_contact=MAY_1)
+    batch.set_followup("Alpha Games", next_contact=MAY_9)
+    assert len(batch) == 3
+    assert batch.commit() == 3
+    assert batch.commit() == 0
+    assert writes == [3]
+    assert store.tags(["Alpha Games"]) == {"Alpha Games": ["Good fit"]}
+    assert store.followups(["Alpha Games"]) == {"Alpha Games": Followup(None, MAY_9)}
+
+
+def test_names_are_matched_without_case_or_spacing(store):
+    batch = store.batch()
+    batch.set_tag("  alpha   GAMES ", "Contacted", True)
+    batch.commit()
+    assert store.tags(["Alpha Games", "Beta Soft"]) == {"Alpha Games": ["Contacted"]}
+
+
+def test_tags_come_back_in_option_order(store):
+    batch = store.batch()
+    for tag in ("Good fit", "Contacted", "Top priority"):
+        batch.set_tag("Alpha Games", tag, True)
+    batch.commit()
+    assert store.tags(["Alpha Games"])["Alpha Games"] == ["Top priority", "Contacted", "Good fit"]
+
+
+def test_clearing_both_dates_removes_the_followup(store):
+    batch = store.batch()
+    batch.set_followup("Alpha Games", last_contacted=MAY_1, next_contact=MAY_9)
+    batch.commit()
+    batch.set_followup("Alpha Games", last_contacted=None, next_contact=None)
+    batch.commit()
+    assert store.followups(["Alpha Games"]).get("Alpha Games", NO_FOLLOWUP) == NO_FOLLOWUP
+
+
+def test_unknown_followup_field(store):
+    with pytest.raises(TypeError, match="next_call"):
+        store.batch().set_followup("Alpha Games", next_call=MAY_1)
+
+
+def test_failed_write_keeps_changes_staged(store, monkeypatch):
+    batch = store.batch()
+    batch.set_tag("Alpha Games", "Contacted", True)
+
+    def failing_write(tags, followups):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "write", failing_write)
+    with pytest.raises(OSError):
+        batch.commit()
+    monkeypatch.undo()
+    assert batch.commit() == 1
+    assert store.tags(["Alpha Games"]) == {"Alpha Games": ["Contacted"]}
+
+
+def test_indexes_follow_writes_from_this_and_other_processes(store, tmp_path):
+    batch = store.batch()
+    batch.set_tag("Alpha Games", "Contacted", True)
+    batch.set_tag("Beta Soft", "Contacted", True)
+    batch.set_tag("Beta Soft", "Good fit", True)
+    batch.set_followup("Alpha Games", next_contact=MAY_9)
+    batch.set_followup("Beta Soft", next_contact=MAY_1)
+    batch.commit()
+    assert store.publishers_with(["Contacted", "Good fit"]) == {"beta soft"}
+    assert store.publishers_with([]) == frozenset()
+    assert store.due_between() == [("beta soft", MAY_1), ("alpha games", MAY_9)]
+
+    # A second store on the same file stands in for another process
+    other = CrmStore(tmp_path / "crm.sqlite3").batch()
+    other.set_tag("Alpha Games", "Good fit", True)
+    other.set_followup("Beta Soft", next_contact=None)
+    other.commit()
+    assert store.publishers_with(["Contacted", "Good fit"]) == {"alpha games", "beta soft"}
+    assert store.due_between(start=MAY_1, end=MAY_9) == [("alpha games", MAY_9)]
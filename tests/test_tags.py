@@ -0,0 +1,55 @@
+"""Tag editing: the bulk editor stages only what each callback changed."""
+
+from publisher_core import widgets
+from publisher_core.store import CrmStore
+from publisher_core.tags import tag_edits
+
+PUBLISHERS = ["Alpha Games", "Beta Soft"]
+EDITOR = "_tag_editor_page_test"
+
+
+def test_tag_edits_skips_cells_already_seen():
+    seen = {0: {"Contacted": True}}
+    edited = {0: {"Contacted": True, "Good fit": True}, 1: {"Contacted": False}}
+    assert list(tag_edits(PUBLISHERS, edited, seen)) == [
+        ("Alpha Games", "Good fit", True),
+        ("Beta Soft", "Contacted", False),
+    ]
+
+
+def test_tag_edits_reports_a_cell_toggled_back():
+    assert list(tag_edits(PUBLISHERS, {0: {"Contacted": False}}, {0: {"Contacted": True}})) == [
+        ("Alpha Games", "Contacted", False),
+    ]
+
+
+def test_later_edit_does_not_revert_another_session(tmp_path, monkeypatch):
+    store = CrmStore(tmp_path / "crm.sqlite3")
+    alice, bob = {}, {}
+
+    def edit(session, edited_rows):
+        # Each dict stands in for one browser session's st.session_state
+        monkeypatch.setattr(widgets.st, "session_state", session)
+        session[EDITOR] = {"edited_rows": edited_rows, "added_rows": [], "deleted_rows": []}
+        writes = store.batch()
+        widgets._stage_tag_edits(EDITOR, PUBLISHERS, writes)
+        return writes.commit()
+
+    assert edit(alice, {0: {"Contacted": True}}) == 1
+    assert edit(bob, {0: {"Contacted": False}}) == 1
+    # Alice's editor still holds her first edit; only the new cell is written
+    assert edit(alice, {0: {"Contacted": True}, 1: {"Good fit": True}}) == 1
+    assert store.tags(PUBLISHERS) == {"Beta Soft": ["Good fit"]}
+
+
+def test_new_editor_starts_from_nothing(tmp_path, monkeypatch):
+    store = CrmStore(tmp_path / "crm.sqlite3")
+    session = {}
+    monkeypatch.setattr(widgets.st, "session_state", session)
+    for key in ("_tag_editor_page_one", "_tag_editor_page_two"):
+        session.pop("_tag_editor_page_one", None)
+        session[key] = {"edited_rows": {0: {"Contacted": True}}, "added_rows": [], "deleted_rows": []}
+        writes = store.batch()
+        widgets._stage_tag_edits(key, PUBLISHERS, writes)
+        assert writes.commit() == 1
+    assert list(session["_tag_editor_seen"]) == ["_tag_editor_page_two"]